@@ -1,14 +1,17 @@
+import concurrent.futures
+import dataclasses
+import hashlib
 import logging
 import os.path
-import re
 import tempfile
-from typing import List
+from typing import Dict, List, Optional, Set
 
 from cryptography import x509
-from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.serialization import pkcs12
 
 from builder2.models import installation_models
-from builder2.utils import replace_non_alphanumeric
+from builder2.utils import get_available_cpu_count, replace_non_alphanumeric
 from builder2.command_line import CommandRunner
 from builder2.exceptions import BuilderException
 from builder2.file_manager import FileManager
@@ -17,27 +20,46 @@ from builder2.models.metadata_models import JdkConfiguration
 from builder2.tools.java_support import EXEC_NAME_JAVA_CACERTS, EXEC_NAME_JAVA_KEYTOOL
 
 
+@dataclasses.dataclass(frozen=True)
+class ParsedCertificate:
+    certificate: x509.Certificate
+    pem_bytes: bytes
+    sanitized_cn: str
+    alias: str
+
+
 class CertificateManager:
     # TODO Assumes debian/ubuntu
     __SYSTEM_CA_LOCATION = "/usr/local/share/ca-certificates"
-    __PEM_CERTIFICATE_START = "-----BEGIN CERTIFICATE-----"
-    __PEM_CERTIFICATE_END = "-----END CERTIFICATE-----"
-    __CERTIFICATE_RECOGNISED_EXTENSIONS = ["*.cert", "*.crt"]
+    __CERTIFICATE_RECOGNISED_EXTENSIONS = (".cert", ".crt")
     __DEFAULT_KEYSTORE_PASSWORD = "changeit"
-
-    __PEM_REGEX = re.compile(
-        f"({__PEM_CERTIFICATE_START}.*?{__PEM_CERTIFICATE_END})", re.DOTALL
-    )
+    __CERTIFICATE_READ_WORKERS = 8
+    __JDK_CERTIFICATES_STAMPS_FILE_NAME = ".jdk-certificates-stamps.json"
 
     def __init__(self, file_manager: FileManager, command_runner: CommandRunner):
         self._file_manager = file_manager
         self._command_runner = command_runner
         self._logger = logging.getLogger(self.__class__.__name__)
 
-    def __read_certs_from_dir(self, cert_dir: str) -> List[x509.Certificate]:
+    @staticmethod
+    def __parse_certificate(certificate: x509.Certificate) -> ParsedCertificate:
+        common_name = certificate.subject.get_attributes_for_oid(
+            x509.oid.NameOID.COMMON_NAME
+        )
+        if not common_name:
+            raise BuilderException("Cannot get name for import certificate")
+        return ParsedCertificate(
+            certificate=certificate,
+            pem_bytes=certificate.public_bytes(encoding=serialization.Encoding.PEM),
+            sanitized_cn=replace_non_alphanumeric(common_name[0].value, "").lower(),
+            alias=common_name[0].value.replace(" ", "").lower(),
+        )
+
+    def __read_certs_from_dir(self, cert_dir: str) -> List[ParsedCertificate]:
         certs = []
+        fingerprints = set()
         try:
-            cert_files = self._file_manager.search_get_files_by_pattern(
+            cert_files = self._file_manager.search_get_files_by_extension(
                 cert_dir, self.__CERTIFICATE_RECOGNISED_EXTENSIONS
             )
         except FileNotFoundError as err:
@@ -45,106 +67,248 @@ class CertificateManager:
                 f"Certificate path '{cert_dir}' does not exist or is not a valid directory"
             ) from err
 
+        # Skip links to files already listed, like the ones c_rehash creates
+        unique_cert_files = {}
         for cert_file in cert_files:
-            content = self._file_manager.read_file_as_text(cert_file)
-            for cert_content in self.__PEM_REGEX.findall(content):
-                certs.append(
-                    x509.load_pem_x509_certificate(cert_content.encode("utf-8"))
-                )
+            unique_cert_files.setdefault(os.path.realpath(cert_file), cert_file)
+        cert_files = list(unique_cert_files.values())
+
+        # Files are read concurrently, overlapping the disk latency of the
+        # following files with the parsing of the ones already read
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.__CERTIFICATE_READ_WORKERS
+        ) as executor:
+            cert_files_content = executor.map(
+                self._file_manager.read_file_as_bytes, cert_files
+            )
+            for cert_file, content in zip(cert_files, cert_files_content):
+                certs.extend(self.__load_certificates(cert_file, content, fingerprints))
 
         return certs
 
-    def __install_system_certs(self, certs: List[x509.Certificate]):
-        for cert in certs:
-            common_name = cert.subject.get_attributes_for_oid(
-                x509.oid.NameOID.COMMON_NAME
+    def __load_certificates(
+        self, cert_file: str, content: bytes, fingerprints: Set[bytes]
+    ) -> List[ParsedCertificate]:
+        certs = []
+        try:
+            file_certs = x509.load_pem_x509_certificates(content)
+        except ValueError:
+            self._logger.warning(
+                "Skipping %s as it contains no valid PEM certificates", cert_file
             )
-            if not common_name:
-                raise BuilderException("Cannot get name for import certificate")
-            sanitized_cn = replace_non_alphanumeric(common_name[0].value, "").lower()
-            cert_path = os.path.join(self.__SYSTEM_CA_LOCATION, f"{sanitized_cn}.crt")
-            self._file_manager.write_text_file(
-                cert_path,
-                cert.public_bytes(encoding=serialization.Encoding.PEM).decode("utf-8"),
+            return certs
+
+        for cert in file_certs:
+            # Bundles usually overlap. Skip certificates already loaded
+            fingerprint = cert.fingerprint(hashes.SHA256())
+            if fingerprint not in fingerprints:
+                fingerprints.add(fingerprint)
+                certs.append(self.__parse_certificate(cert))
+        return certs
+
+    def __install_system_certs(self, certs: List[ParsedCertificate]):
+        installed_count = 0
+        for cert in certs:
+            cert_path = os.path.join(
+                self.__SYSTEM_CA_LOCATION, f"{cert.sanitized_cn}.crt"
             )
+            # Only touch the certificates that are not already installed
+            if (
+                self._file_manager.read_file_as_bytes(cert_path, ignore_failure=True)
+                != cert.pem_bytes
+            ):
+                self._file_manager.write_binary_file(cert_path, cert.pem_bytes)
+                installed_count += 1
 
         # TODO Assumes debian/ubuntu
-        # If no certs loaded just skip calling the SO to install them
-        if certs:
+        # If no certs were added or modified just skip calling the SO to install them
+        if installed_count:
             self._logger.info(
-                "Installed %d certificates into system truststore", len(certs)
+                "Installed %d certificates into system truststore", installed_count
             )
             self._command_runner.run_process(
-                ["update-ca-certificates", "--fresh"], shell=True
+                ["update-ca-certificates", "--fresh"], stream=False
             )
+        else:
+            self._logger.debug("System truststore certificates already up to date")
 
-    def __install_keystore_certificate(
+    def __build_truststore(self, certs: List[ParsedCertificate]) -> bytes:
+        # Legacy PBE/MAC algorithms are used on purpose, as old JDK 8 releases
+        # are not able to open PKCS12 stores protected with PBES2/AES
+        encryption = (
+            serialization.PrivateFormat.PKCS12.encryption_builder()
+            .key_cert_algorithm(pkcs12.PBES.PBESv1SHA1And3KeyTripleDESCBC)
+            .hmac_hash(hashes.SHA1())
+            .build(self.__DEFAULT_KEYSTORE_PASSWORD.encode("utf-8"))
+        )
+        # Certificates sharing a CN would overwrite each other, so the ones after
+        # the first get a short fingerprint suffix
+        truststore_certs = []
+        aliases = set()
+        for cert in certs:
+            alias = cert.alias
+            if alias in aliases:
+                fingerprint = cert.certificate.fingerprint(hashes.SHA256()).hex()
+                alias = f"{alias}-{fingerprint[:8]}"
+            aliases.add(alias)
+            truststore_certs.append(
+                pkcs12.PKCS12Certificate(cert.certificate, alias.encode("utf-8"))
+            )
+        return pkcs12.serialize_java_truststore(truststore_certs, encryption)
+
+    def __import_truststore(
         self,
         installation_summary: installation_models.ComponentInstallationModel,
-        certificate: x509.Certificate,
-        name: str = None,
+        truststore_path: str,
+        certs_count: int,
     ):
-        common_name = certificate.subject.get_attributes_for_oid(
-            x509.oid.NameOID.COMMON_NAME
-        )[0].value
-        if not name:
-            name = common_name.replace(" ", "").lower()
-
-        # JDKs above 8 has a -cacerts option that allows not providing an explicit cacerts path
-        keystore_opts = (
-            ["-keystore", installation_summary.wellknown_paths[EXEC_NAME_JAVA_CACERTS]]
-            if int(installation_summary.version.split(".")[0]) < 9
-            else ["-cacerts"]
+        self._logger.debug(
+            "Installing certificates for JDK %s", installation_summary.version
         )
-
-        with tempfile.NamedTemporaryFile(mode="wb") as tmp:
-            tmp.write(certificate.public_bytes(encoding=serialization.Encoding.DER))
-            tmp.flush()
-            self._command_runner.run_process(
-                [
-                    installation_summary.wellknown_paths[EXEC_NAME_JAVA_KEYTOOL],
-                    "-importcert",
-                    "-noprompt",
-                    "-storepass",
-                    self.__DEFAULT_KEYSTORE_PASSWORD,
-                    "-file",
-                    tmp.name,
-                    "-alias",
-                    name,
-                ]
-                + keystore_opts
+        if EXEC_NAME_JAVA_CACERTS not in installation_summary.wellknown_paths:
+            self._logger.warning(
+                "Skipping java certificates installation as no cacerts path is present"
             )
-            self._logger.debug(
-                "Certificate with CN %s installed in JDK %s",
-                common_name,
-                installation_summary.version,
+            return
+
+        self._command_runner.run_process(
+            [
+                installation_summary.wellknown_paths[EXEC_NAME_JAVA_KEYTOOL],
+                "-importkeystore",
+                "-noprompt",
+                "-srckeystore",
+                truststore_path,
+                "-srcstoretype",
+                "PKCS12",
+                "-srcstorepass",
+                self.__DEFAULT_KEYSTORE_PASSWORD,
+                "-destkeystore",
+                installation_summary.wellknown_paths[EXEC_NAME_JAVA_CACERTS],
+                "-deststorepass",
+                self.__DEFAULT_KEYSTORE_PASSWORD,
+            ],
+            stream=False,
+        )
+        self._logger.info(
+            "Installed %d certificates in JDK %s",
+            certs_count,
+            installation_summary.version,
+        )
+
+    @staticmethod
+    def __compute_certs_digest(certs: List[ParsedCertificate]) -> str:
+        digest = hashlib.sha256()
+        for pem_bytes in sorted(cert.pem_bytes for cert in certs):
+            digest.update(pem_bytes)
+        return digest.hexdigest()
+
+    @staticmethod
+    def __build_cacerts_stamp(
+        jdk_installation: installation_models.ComponentInstallationModel,
+        certs_digest: str,
+    ) -> Optional[str]:
+        cacerts_path = jdk_installation.wellknown_paths.get(EXEC_NAME_JAVA_CACERTS)
+        if not cacerts_path or not os.path.isfile(cacerts_path):
+            return None
+
+        # cacerts size and mtime change if something, like a JDK reinstallation,
+        # rewrites it, and that's cheaper than hashing its content
+        cacerts_stat = os.stat(cacerts_path)
+        return f"{certs_digest}:{cacerts_stat.st_size}:{cacerts_stat.st_mtime_ns}"
+
+    def __get_stamps_path(
+        self, installation_summary: InstallationSummary
+    ) -> Optional[str]:
+        if not installation_summary.path:
+            return None
+        return os.path.join(
+            os.path.dirname(installation_summary.path),
+            self.__JDK_CERTIFICATES_STAMPS_FILE_NAME,
+        )
+
+    def __read_stamps(self, stamps_path: Optional[str]) -> Dict[str, str]:
+        if not stamps_path:
+            return {}
+        try:
+            return self._file_manager.read_json_file(stamps_path)
+        except (OSError, ValueError):
+            return {}
+
+    def __write_stamps(self, stamps_path: Optional[str], stamps: Dict[str, str]):
+        if not stamps_path:
+            return
+        try:
+            self._file_manager.write_as_json(stamps_path, stamps)
+        except OSError as err:
+            self._logger.warning(
+                "Cannot save JDK certificates stamps to %s: %s", stamps_path, err
             )
 
     def __install_jdk_certificates(
-        self, installation_summary: InstallationSummary, certs: List[x509.Certificate]
+        self, installation_summary: InstallationSummary, certs: List[ParsedCertificate]
     ):
-        for jdk_installation in installation_summary.get_components_by_type(
+        jdk_installations = installation_summary.get_components_by_type(
             JdkConfiguration
-        ):
-            self._logger.debug(
-                "Installing certificates for JDK %s", jdk_installation.version
-            )
-            if EXEC_NAME_JAVA_CACERTS in jdk_installation.wellknown_paths:
-                for cert in certs:
-                    self.__install_keystore_certificate(jdk_installation, cert)
-                self._logger.info(
-                    "Installed %d certificates in JDK %s",
-                    len(certs),
-                    jdk_installation.version,
-                )
-            else:
-                self._logger.warning(
-                    "Skipping java certificates installation as no cacerts path is present"
-                )
+        )
+        if not certs or not jdk_installations:
+            return
+
+        # Skip the JDKs whose cacerts already got the same set of certificates
+        # and haven't been modified since then
+        certs_digest = self.__compute_certs_digest(certs)
+        stamps_path = self.__get_stamps_path(installation_summary)
+        stamps = self.__read_stamps(stamps_path)
+        pending_installations = []
+        for jdk_installation in jdk_installations:
+            stamp = self.__build_cacerts_stamp(jdk_installation, certs_digest)
+            if not stamp or stamp != stamps.get(
+                jdk_installation.wellknown_paths[EXEC_NAME_JAVA_CACERTS]
+            ):
+                pending_installations.append(jdk_installation)
+        if not pending_installations:
+            self._logger.debug("JDKs certificates already up to date")
+            return
+
+        # All the certificates are staged in a single truststore that is merged
+        # into each JDK cacerts with only one keytool call per JDK
+        with tempfile.NamedTemporaryFile(mode="wb", suffix=".p12") as truststore_file:
+            truststore_file.write(self.__build_truststore(certs))
+            truststore_file.flush()
+
+            # Each JDK has its own cacerts, so keytool calls can run concurrently
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(len(pending_installations), get_available_cpu_count())
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        self.__import_truststore,
+                        jdk_installation,
+                        truststore_file.name,
+                        len(certs),
+                    )
+                    for jdk_installation in pending_installations
+                ]
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
+
+        for jdk_installation in pending_installations:
+            stamp = self.__build_cacerts_stamp(jdk_installation, certs_digest)
+            if stamp:
+                cacerts_path = jdk_installation.wellknown_paths[EXEC_NAME_JAVA_CACERTS]
+                stamps[cacerts_path] = stamp
+        self.__write_stamps(stamps_path, stamps)
 
     def install_all_certificates(
         self, installation_summary: InstallationSummary, certs_path: str
     ):
         certs = self.__read_certs_from_dir(certs_path)
-        self.__install_jdk_certificates(installation_summary, certs)
-        self.__install_system_certs(certs)
+        if not certs:
+            self._logger.debug("No certificates to install found in %s", certs_path)
+            return
+
+        # The system and the JDKs truststores are independent, so the system one
+        # is updated while the certificates are imported into the JDKs
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            system_certs_future = executor.submit(self.__install_system_certs, certs)
+            self.__install_jdk_certificates(installation_summary, certs)
+            system_certs_future.result()
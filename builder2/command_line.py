@@ -1,5 +1,6 @@
 import logging
 import os
+import shutil
 import signal
 import subprocess
 import threading
@@ -16,16 +17,20 @@ class CommandRunner:
             self.daemon = False
             self.fdRead, self.fdWrite = os.pipe()
             self.pipeReader = os.fdopen(self.fdRead)
-            self.start()
-            self.output = ""
+            self._chunks = []
             self._logger = logger
+            self.start()
+
+        @property
+        def output(self):
+            return "".join(self._chunks)
 
         def fileno(self):
             return self.fdWrite
 
         def run(self):
             for line in iter(self.pipeReader.readline, ""):
-                self.output = self.output + line
+                self._chunks.append(line)
                 if self._logger:
                     self._logger.info(line.strip("\n"))
 
@@ -54,17 +59,10 @@ class CommandRunner:
                 except OSError:
                     pass
 
-    def run_process(
-        self,
-        command_list: List[str],
-        cwd: str = None,
-        timeout: int = 180,
-        shell: bool = False,
-        silent: bool = False,
-    ):
-        working_dir = os.getcwd() if not cwd else cwd
-        start_time = time.time()
-        with self.__LogPipe(self._logger if not silent else None) as pipe:
+    def __run_streamed(
+        self, command_list, working_dir, timeout, shell
+    ) -> subprocess.CompletedProcess:
+        with self.__LogPipe(self._logger) as pipe:
             process = None
             try:
                 process = subprocess.Popen(
@@ -75,38 +73,103 @@ class CommandRunner:
                     universal_newlines=True,
                     shell=shell,
                     cwd=working_dir,
-                    # If shell is used attach the setsid to
+                    # If shell is used start a new session to
                     # allow group kill of the processes
-                    preexec_fn=os.setsid if shell else None,
+                    start_new_session=shell,
                 )
                 process.wait(timeout=timeout)
-                if process.returncode != 0:
-                    raise subprocess.CalledProcessError(
-                        process.returncode, command_list, output=pipe.output
-                    )
-
-                return pipe.output
-            except subprocess.CalledProcessError:
-                self._logger.debug(
-                    "Failed to execute %s. Exit code non-zero.", command_list
+                return subprocess.CompletedProcess(
+                    command_list, process.returncode, stdout=pipe.output
                 )
-                raise
-            except subprocess.TimeoutExpired:
-                self._logger.error(
-                    "Failed to execute %s. Timeout (%d)", command_list, timeout
-                )
-                raise
             finally:
                 self.__process_cleanup(process, shell)
-                self._logger.debug(
-                    " Command '%s' took %f seconds to execute",
-                    command_list,
-                    (time.time() - start_time),
+
+    def __run_captured(
+        self, command_list, working_dir, timeout, shell, silent
+    ) -> subprocess.CompletedProcess:
+        process = None
+        try:
+            process = subprocess.Popen(
+                command_list,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+                shell=shell,
+                cwd=working_dir,
+                # If shell is used start a new session to
+                # allow group kill of the processes
+                start_new_session=shell,
+            )
+            output, _ = process.communicate(timeout=timeout)
+        finally:
+            self.__process_cleanup(process, shell)
+
+        if not silent:
+            for line in output.splitlines():
+                self._logger.info(line)
+        return subprocess.CompletedProcess(
+            command_list, process.returncode, stdout=output
+        )
+
+    def run_process(
+        self,
+        command_list: List[str],
+        cwd: str = None,
+        timeout: int = 180,
+        shell: bool = False,
+        silent: bool = False,
+        stream: bool = True,
+    ):
+        working_dir = os.getcwd() if not cwd else cwd
+        start_time = time.time()
+        try:
+            # Output is only streamed to the logger while the command runs if
+            # asked to. Short-lived commands just capture it and log it at exit
+            result = (
+                self.__run_streamed(command_list, working_dir, timeout, shell)
+                if stream and not silent
+                else self.__run_captured(
+                    command_list, working_dir, timeout, shell, silent
+                )
+            )
+            if result.returncode != 0:
+                raise subprocess.CalledProcessError(
+                    result.returncode, command_list, output=result.stdout
                 )
 
+            return result.stdout
+        except subprocess.CalledProcessError:
+            self._logger.debug(
+                "Failed to execute %s. Exit code non-zero.", command_list
+            )
+            raise
+        except subprocess.TimeoutExpired:
+            self._logger.error(
+                "Failed to execute %s. Timeout (%d)", command_list, timeout
+            )
+            raise
+        finally:
+            self._logger.debug(
+                " Command '%s' took %f seconds to execute",
+                command_list,
+                (time.time() - start_time),
+            )
+
     def exec_command(self, command: List[str], env: Dict[str, str]):
+        # Paths (like the resolved user shell) are executed as they are. Bare names
+        # are resolved once against the PATH of the target environment
+        executable = (
+            command[0]
+            if os.path.dirname(command[0])
+            else shutil.which(command[0], path=env.get("PATH", os.defpath))
+        )
         try:
-            os.execvpe(command[0], command, env)
+            if executable:
+                os.execve(executable, command, env)
+            else:
+                # Let execvpe report the proper errno if the command cannot be found
+                os.execvpe(command[0], command, env)
         except OSError as err:
             # If failed to execute (command not found, no permissions, etc.) get the errno and set it as return code
             self._logger.debug(
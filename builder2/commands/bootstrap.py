@@ -1,42 +1,54 @@
+from __future__ import annotations
+
+import functools
 import logging
 import os
 import pwd
 import signal
-import subprocess
 import sys
+import typing
 
 import configargparse
 from dependency_injector.wiring import inject, Provide
 
-import builder2.loggers
 from builder2 import constants
-from builder2.certificate_manager import CertificateManager
-from builder2.command_line import CommandRunner
 from builder2.commands import command_commons
-from builder2.di import Container
-from builder2.environment_builder import EnvironmentBuilder
 from builder2.exceptions import BuilderException
-from builder2.file_manager import FileManager
+
+# Services are injected by name, so the modules that implement them (and
+# their dependencies) are only loaded when the container is wired
+if typing.TYPE_CHECKING:
+    from builder2.certificate_manager import CertificateManager
+    from builder2.command_line import CommandRunner
+    from builder2.environment_builder import EnvironmentBuilder
+    from builder2.file_manager import FileManager
 
 __logger = logging.getLogger(__name__)
 
-__FALLBACK_SHELLS = ["/bin/bash, /bin/sh"]
+__FALLBACK_SHELLS = ("/bin/bash", "/bin/sh")
 
 
 def __get_fallback_shell():
-    for shell in __FALLBACK_SHELLS:
-        try:
-            subprocess.call([shell])
-        except FileNotFoundError:
-            # Do nothing
-            pass
-        return shell
-    return None
+    # Check the shell can be launched without actually spawning it
+    return next(
+        (shell for shell in __FALLBACK_SHELLS if os.access(shell, os.X_OK)), None
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def __get_passwd_entry(uid: int) -> pwd.struct_passwd:
+    return pwd.getpwuid(uid)
 
 
 def __get_user_shell():
+    # SHELL is usually already set by the login process. Prefer it, as
+    # passwd lookups may go through NSS remote backends (sssd, LDAP...)
+    shell = os.environ.get("SHELL")
+    if shell and os.access(shell, os.X_OK):
+        return shell
+
     try:
-        pwddb = pwd.getpwuid(os.getuid())
+        pwddb = __get_passwd_entry(os.getuid())
         if pwddb.pw_shell:
             return pwddb.pw_shell
     except KeyError:
@@ -45,6 +57,7 @@ def __get_user_shell():
     return None
 
 
+@functools.lru_cache(maxsize=1)
 def __get_default_shell():
     shell = __get_user_shell()
     if not shell:
@@ -57,78 +70,84 @@ def __get_default_shell():
 
 
 def __prepare_command(args):
-    bootstrap_cmd = args.remainder
-    if len(bootstrap_cmd) > 0 and bootstrap_cmd[0] == "--":
-        bootstrap_cmd = bootstrap_cmd[1:]
-    if len(bootstrap_cmd) > 0 and bootstrap_cmd[0] == "":
-        bootstrap_cmd = bootstrap_cmd[1:]
+    # Skip the leading "--" separator and/or empty argument with a single slice
+    start = 1 if args.remainder[:1] == ["--"] else 0
+    if args.remainder[start : start + 1] == [""]:
+        start += 1
+    bootstrap_cmd = args.remainder[start:] if start else args.remainder
 
     # If command was launched with arguments use them
     # If not, just try to get the default shell and launch it
     return bootstrap_cmd if bootstrap_cmd else [__get_default_shell()]
 
 
-def __signal_handler(_, __):
-    # 130 is the bash exit code for SIGINTs
-    sys.exit(130)
-
-
 @inject
 def __bootstrap(
     args,
-    file_manager: FileManager = Provide[Container.file_manager],
-    certificate_manager: CertificateManager = Provide[Container.certificate_manager],
-    command_runner: CommandRunner = Provide[Container.command_runner],
-    environment_builder: EnvironmentBuilder = Provide[Container.environment_builder],
+    file_manager: FileManager = Provide["file_manager"],
+    certificate_manager: CertificateManager = Provide["certificate_manager"],
+    command_runner: CommandRunner = Provide["command_runner"],
+    environment_builder: EnvironmentBuilder = Provide["environment_builder"],
 ):
-    # Listen for process SIGNITs. If listener is not added SIGINT inside a container shell hangs the shell forever
-    signal.signal(signal.SIGINT, __signal_handler)
-
     try:
-        builder2.loggers.configure("INFO" if not args.quiet else "ERROR")
-
         installation_summary = command_commons.get_installation_summary_from_args(
             args, file_manager
         )
 
-        # If cert path is given and exists go install them
-        # (if path doesn't exist an exception is raised internally)
-        if args.certs_dir and os.path.exists(args.certs_dir):
+        # If cert path is given and is a directory go install them
+        if args.certs_dir and os.path.isdir(args.certs_dir):
             certificate_manager.install_all_certificates(
                 installation_summary, args.certs_dir
             )
         elif args.certs_dir:
             __logger.warning(
-                "Skipping loading certificates. %s does not exist", args.certs_dir
+                "Skipping loading certificates. %s is not a valid directory",
+                args.certs_dir,
             )
 
         bootstrap_cmd = __prepare_command(args)
         env_vars = environment_builder.build_environment_variables(
             installation_summary, args.generate_vars
         )
+        # The launched command handles SIGINTs by itself
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
         command_runner.exec_command(bootstrap_cmd, env_vars)
+    except KeyboardInterrupt:
+        # 130 is the bash exit code for SIGINTs. Explicitly exit, as
+        # SIGINT inside a container shell may hang the shell forever otherwise
+        sys.exit(130)
     except OSError as err:
         sys.exit(err.errno)
     except BuilderException as err:
         command_commons.manage_builder_exceptions(err)
 
 
+__COMMAND_ARGUMENTS = (
+    (
+        ("--quiet",),
+        {
+            "dest": "quiet",
+            "action": "store_true",
+            "help": "Disable all no error logs",
+        },
+    ),
+    (
+        ("--generate-vars",),
+        {
+            "dest": "generate_vars",
+            "action": "store_true",
+            "env_var": constants.ENV_VAR_GENERATE_VARS,
+            "help": "Enable component generated environment variables",
+        },
+    ),
+    (("remainder",), {"nargs": configargparse.REMAINDER}),
+)
+
+
 def register(subparsers):
     command_parser = subparsers.add_parser("bootstrap")
     command_parser.set_defaults(func=__bootstrap, quiet=True, generate_vars=False)
     command_commons.register_installation_summary_arg_option(command_parser)
     command_commons.register_certificates_arg_option(command_parser)
-    command_parser.add_argument(
-        "--quiet",
-        dest="quiet",
-        action="store_true",
-        help="Disable all no error logs",
-    )
-    command_parser.add_argument(
-        "--generate-vars",
-        dest="generate_vars",
-        action="store_true",
-        env_var=constants.ENV_VAR_GENERATE_VARS,
-        help="Enable component generated environment variables",
-    )
-    command_parser.add_argument("remainder", nargs=configargparse.REMAINDER)
+    for names, options in __COMMAND_ARGUMENTS:
+        command_parser.add_argument(*names, **options)
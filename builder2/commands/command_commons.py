@@ -1,11 +1,21 @@
+from __future__ import annotations
+
 import json
 import logging
 import sys
+import typing
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from builder2 import constants
 from builder2.exceptions import BuilderException, BuilderValidationException
-from builder2.file_manager import FileManager
-from builder2.installation_summary import InstallationSummary
+
+if typing.TYPE_CHECKING:
+    from builder2.file_manager import FileManager
+    from builder2.installation_summary import InstallationSummary
 
 __logger = logging.getLogger(__name__)
 
@@ -13,6 +23,8 @@ __logger = logging.getLogger(__name__)
 def get_installation_summary_from_args(
     args, file_manager: FileManager
 ) -> InstallationSummary:
+    from builder2.installation_summary import InstallationSummary
+
     try:
         return InstallationSummary.from_path(args.summary_path, file_manager)
     except FileNotFoundError as err:
@@ -42,11 +54,21 @@ def register_certificates_arg_option(command_parser, required=False):
     )
 
 
+def __format_validation_details(details) -> str:
+    if orjson:
+        # Marshmallow uses the index of the item as key for errors in lists
+        return orjson.dumps(
+            details,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        ).decode("utf-8")
+    return json.dumps(details, sort_keys=True, indent=2)
+
+
 def manage_builder_exceptions(exception):
     if isinstance(exception, BuilderValidationException):
         __logger.error(exception.message)
         if exception.details:
-            __logger.error(json.dumps(exception.details, sort_keys=True, indent=4))
+            __logger.error(__format_validation_details(exception.details))
         sys.exit(1)
     elif isinstance(exception, BuilderException):
         __logger.error(str(exception.message))
@@ -1,22 +1,35 @@
+from __future__ import annotations
+
 import logging
-import os
+import typing
 
 from dependency_injector.wiring import inject, Provide
 
-import builder2.loggers
 from builder2.commands import command_commons
-from builder2.conan_manager import CONAN_PROFILE_TYPES
-from builder2.di import Container
+from builder2.constants import CONAN_PROFILE_TYPES
 from builder2.exceptions import BuilderException
-from builder2.file_manager import FileManager
-from builder2.models.installation_models import ComponentInstallationModel
+
+# Services are injected by name to avoid loading them before the query runs
+if typing.TYPE_CHECKING:
+    from builder2.file_manager import FileManager
+    from builder2.models.installation_models import ComponentInstallationModel
 
 __logger = logging.getLogger(__name__)
 
+__CONAN_PROFILE_CHOICES = tuple(
+    conan_type.lower() for conan_type in CONAN_PROFILE_TYPES
+)
+
 
 def __print_result(args, data):
     if data:
-        to_print = data if isinstance(data, str) else os.linesep.join(data)
+        if isinstance(data, str):
+            to_print = data
+        elif len(data) == 1:
+            to_print = data[0]
+        else:
+            # print already translates newlines to the platform separator
+            to_print = "\n".join(data)
         __logger.info("Query result: %s", to_print)
         print(to_print)
     else:
@@ -69,11 +82,9 @@ def __triplet_query(args, component: ComponentInstallationModel):
 @inject
 def __get_variable(
     args,
-    file_manager: FileManager = Provide[Container.file_manager],
+    file_manager: FileManager = Provide["file_manager"],
 ):
     try:
-        builder2.loggers.configure("INFO" if not args.quiet else "ERROR")
-
         installation_summary = command_commons.get_installation_summary_from_args(
             args, file_manager
         )
@@ -122,7 +133,7 @@ def __register_conan_query(query_subparsers):
         "type",
         nargs="?",
         help="Conan profile type",
-        choices=[conan_type.lower() for conan_type in CONAN_PROFILE_TYPES],
+        choices=__CONAN_PROFILE_CHOICES,
     )
 
 
@@ -1,38 +1,61 @@
+from __future__ import annotations
+
+import concurrent.futures
+import functools
 import logging
 import os
-import pathlib
+import threading
 import typing
 from typing import Dict
 
-import marshmallow.exceptions
 from dependency_injector.wiring import inject, Provide
 
-import builder2.loggers
-import builder2.environment_builder
-from builder2.file_manager import FileManager
-from builder2.di import Container, container_instance
-from builder2.package_manager import PackageManager
+import builder2.utils
 from builder2.commands import command_commons
 from builder2.exceptions import BuilderException, BuilderValidationException
-from builder2.installation_summary import InstallationSummary
-from builder2.models.metadata_models import (
-    ToolchainMetadataConfigurationSchema,
-    ToolchainMetadataConfiguration,
-    BaseComponentConfiguration,
-)
-from builder2.conan_manager import ConanManager
+
+# The install subsystem is only imported when the command runs, so other
+# commands don't pay for loading it
+if typing.TYPE_CHECKING:
+    from builder2.conan_manager import ConanManager
+    from builder2.file_manager import FileManager
+    from builder2.installation_summary import InstallationSummary
+    from builder2.models.installation_models import (
+        ComponentInstallationModel,
+        PackageInstallationModel,
+    )
+    from builder2.models.metadata_models import (
+        ToolchainMetadataConfiguration,
+        BaseComponentConfiguration,
+    )
+    from builder2.package_manager import PackageManager
+    from builder2.tools.tool_installers import ToolInstaller
 
 __logger = logging.getLogger(__name__)
 
+__FETCH_WORKERS = 8
+__CPU_COUNT = builder2.utils.get_available_cpu_count()
+
+
+@functools.lru_cache(maxsize=1)
+def __get_toolchain_metadata_schema():
+    # Building the nested schemas is expensive and loading doesn't mutate them
+    from builder2.models.metadata_models import ToolchainMetadataConfigurationSchema
+
+    return ToolchainMetadataConfigurationSchema()
+
 
 def __load_toolchain_metadata(path, file_manager) -> ToolchainMetadataConfiguration:
+    import marshmallow.exceptions
+
+    absolute_path = os.path.abspath(path)
     try:
-        return ToolchainMetadataConfigurationSchema().load(
-            data=file_manager.read_json_file(pathlib.Path(path).absolute())
+        return __get_toolchain_metadata_schema().load(
+            data=file_manager.read_json_file(absolute_path)
         )
     except FileNotFoundError as err:
         raise BuilderException(
-            f"Toolchain metadata file '{path}' not found", exit_code=2
+            f"Toolchain metadata file '{absolute_path}' not found", exit_code=2
         ) from err
     except marshmallow.exceptions.ValidationError as err:
         raise BuilderValidationException(
@@ -40,87 +63,316 @@ def __load_toolchain_metadata(path, file_manager) -> ToolchainMetadataConfigurat
         ) from err
 
 
-def __sort_components_stack(
-    components_dependencies_graph, graph_iface, visited, components_stack
-):
-    visited.append(graph_iface)
+def __sort_components_by_level(
+    component_configs: typing.Dict[str, BaseComponentConfiguration],
+) -> typing.List[typing.Dict[str, BaseComponentConfiguration]]:
+    # Kahn's topological sort. Each round is a level whose components only
+    # depend on the ones of previous levels. A component depends on one
+    # component at most
+    dependents = {name: [] for name in component_configs}
+    in_degree = {}
+    for name, data in component_configs.items():
+        in_degree[name] = 0
+        if data.depends_on:
+            if data.depends_on not in dependents:
+                raise BuilderValidationException(
+                    "Validation issues in toolchain metadata",
+                    {name: f"Depends on unknown component '{data.depends_on}'"},
+                )
+            dependents[data.depends_on].append(name)
+            in_degree[name] = 1
 
-    element = components_dependencies_graph[graph_iface]
-    if element and element not in visited:
-        __sort_components_stack(
-            components_dependencies_graph, element, visited, components_stack
+    levels = []
+    sorted_count = 0
+    level = [name for name, degree in in_degree.items() if degree == 0]
+    while level:
+        levels.append({name: component_configs[name] for name in level})
+        sorted_count += len(level)
+        next_level = []
+        for name in level:
+            for dependent in dependents[name]:
+                in_degree[dependent] -= 1
+                if not in_degree[dependent]:
+                    next_level.append(dependent)
+        level = next_level
+
+    if sorted_count != len(component_configs):
+        raise BuilderValidationException(
+            "Circular dependencies in toolchain metadata components",
+            {
+                name: data.depends_on
+                for name, data in component_configs.items()
+                if in_degree[name]
+            },
         )
-    components_stack.append(graph_iface)
+    return levels
 
 
-def __sort_components(
-    component_configs: typing.Dict[str, BaseComponentConfiguration]
-) -> typing.Dict[str, BaseComponentConfiguration]:
-    # Prepare the dependency graph
-    components_dependencies_graph = {}
-    components_graph_set = set()
+def __run_installer(
+    installer: ToolInstaller, fetch_future: concurrent.futures.Future
+) -> ComponentInstallationModel:
+    # Waiting inside the context, so a failed download still cleans up the
+    # target and temporary directories
+    with installer:
+        fetch_future.result()
+        return installer.run_installation()
+
+
+def __load_previous_summary(
+    target_dir: str, file_manager: FileManager
+) -> typing.Optional[InstallationSummary]:
+    from builder2.installation_summary import InstallationSummary
+
+    try:
+        return InstallationSummary.from_path(target_dir, file_manager)
+    except FileNotFoundError:
+        return None
+    except (BuilderValidationException, ValueError, OSError) as err:
+        # A summary left corrupt by an interrupted run just disables the reuse
+        __logger.warning(
+            "Cannot load the previous installation summary from %s: %s. "
+            "All components will be installed",
+            target_dir,
+            err,
+        )
+        return None
 
-    for name, data in component_configs.items():
-        if name not in components_dependencies_graph:
-            components_dependencies_graph[name] = None
-        components_dependencies_graph[name] = data.depends_on
-        components_graph_set.add(name)
-
-    visited = []
-    components_stack = []
-    for graph_iface in components_graph_set:
-        if graph_iface not in visited:
-            __sort_components_stack(
-                components_dependencies_graph,
-                graph_iface,
-                visited,
-                components_stack,
-            )
 
-    return {name: component_configs[name] for name in components_stack}
+def __get_reusable_components(
+    levels: typing.List[Dict[str, BaseComponentConfiguration]],
+    previous_components: Dict[str, ComponentInstallationModel],
+) -> Dict[str, ComponentInstallationModel]:
+    # A component is kept as it is if neither its configuration nor the one of
+    # the component it depends on changed since it was installed
+    reusable_components = {}
+    for level in levels:
+        for component_key, component_config in level.items():
+            previous_component = previous_components.get(component_key)
+            if (
+                previous_component
+                and previous_component.configuration == component_config
+                and os.path.isdir(previous_component.path)
+                and (
+                    not component_config.depends_on
+                    or component_config.depends_on in reusable_components
+                )
+            ):
+                reusable_components[component_key] = previous_component
+    return reusable_components
+
+
+def __get_reused_packages(
+    previous_packages: typing.List[PackageInstallationModel],
+    reused_installers: typing.List[ToolInstaller],
+) -> typing.List[PackageInstallationModel]:
+    from builder2.models.installation_models import AptPackageInstallationModel
+    from builder2.models.metadata_models import AptPackageInstallationConfiguration
+
+    # Transient packages were removed at the end of the run that installed them.
+    # Pip packages are not needed, as they are listed from the environments
+    required_packages = {
+        (package.name, package.version)
+        for installer in reused_installers
+        for package in installer.get_required_packages()
+        if isinstance(package, AptPackageInstallationConfiguration)
+        and not package.build_transient
+    }
+    return [
+        package
+        for package in previous_packages
+        if isinstance(package, AptPackageInstallationModel)
+        and (package.name, package.version) in required_packages
+    ]
+
+
+def __get_installer_core_count(
+    level: Dict[str, BaseComponentConfiguration],
+    reusable_components: Dict[str, ComponentInstallationModel],
+    max_workers: int,
+) -> int:
+    # The components of a level are built concurrently, so they share the cores
+    # instead of each one running as many compile jobs as cores are available
+    concurrent_count = min(
+        sum(1 for component_key in level if component_key not in reusable_components),
+        max_workers,
+    )
+    return max(1, max_workers // max(1, concurrent_count))
 
 
 def __install_components(
-    components: Dict[str, BaseComponentConfiguration],
+    toolchain_metadata: ToolchainMetadataConfiguration,
     target_dir: str,
     installation_summary: InstallationSummary,
+    file_manager: FileManager,
+    package_manager: PackageManager,
     conan_manager: ConanManager,
+    max_workers: int,
 ):
-    for component_key, component_config in __sort_components(components).items():
-        with container_instance.tool_installers(
-            type(component_config).__name__, component_key, component_config, target_dir
-        ) as installer:
-            installation_model = installer.run_installation()
-            conan_manager.add_profiles_to_component(
+    from builder2.di import container_instance
+    from builder2.models.metadata_models import AptPackageInstallationConfiguration
+
+    sorted_levels = __sort_components_by_level(toolchain_metadata.components)
+    previous_summary = __load_previous_summary(target_dir, file_manager)
+    reusable_components = __get_reusable_components(
+        sorted_levels, previous_summary.get_components() if previous_summary else {}
+    )
+
+    # Resolve the installer factory of each configuration type only once
+    installer_factories = {
+        config_type: container_instance.tool_installers.providers[config_type.__name__]
+        for config_type in {
+            type(component_config)
+            for component_config in toolchain_metadata.components.values()
+        }
+    }
+
+    # Installers are built in order, as they register their python
+    # environments, that dependent components may reuse, when created.
+    # Reused components need them too, for that reason
+    levels = [
+        {
+            component_key: installer_factories[type(component_config)](
                 component_key,
-                installation_model,
+                component_config,
+                target_dir,
+                core_count=__get_installer_core_count(
+                    level, reusable_components, max_workers
+                ),
+            )
+            for component_key, component_config in level.items()
+        }
+        for level in sorted_levels
+    ]
+
+    # The system packages of all the components are installed with the global
+    # ones in a single apt run. Pip packages are left to each component, as
+    # they may need what the previous components installed. Reused components
+    # are not built, so their packages are not needed
+    package_manager.install_packages(
+        toolchain_metadata.packages
+        + [
+            package
+            for level in levels
+            for component_key, installer in level.items()
+            if component_key not in reusable_components
+            for package in installer.get_required_packages()
+            if isinstance(package, AptPackageInstallationConfiguration)
+        ]
+    )
+
+    # The apt packages of the reused components were installed by a previous
+    # run, so they are only carried over to the new summary
+    if reusable_components:
+        installation_summary.add_packages(
+            __get_reused_packages(
+                previous_summary.get_packages(),
+                [
+                    installer
+                    for level in levels
+                    for component_key, installer in level.items()
+                    if component_key in reusable_components
+                ],
+            )
+        )
+
+    # Sources of all components are downloaded in the background, so the
+    # downloads of the next levels overlap with the builds of the current one
+    fetch_executor = concurrent.futures.ThreadPoolExecutor(max_workers=__FETCH_WORKERS)
+    fetch_cancel_event = threading.Event()
+    fetches = {
+        component_key: fetch_executor.submit(installer.fetch, fetch_cancel_event)
+        for level in levels
+        for component_key, installer in level.items()
+        if component_key not in reusable_components
+    }
+    try:
+        for level in levels:
+            __install_level(
+                level,
+                fetches,
+                reusable_components,
                 target_dir,
+                installation_summary,
+                conan_manager,
+                max_workers,
             )
-            installation_summary.add_component(component_key, installation_model)
+    finally:
+        # If an installation fails, the downloads not started yet are dropped
+        # and the running ones stop at their next chunk. The process still
+        # waits for them at exit, as the fetch threads are joined then. On
+        # success all of them are already done
+        fetch_cancel_event.set()
+        for fetch_future in fetches.values():
+            fetch_future.cancel()
+        fetch_executor.shutdown(wait=False)
+
+
+def __install_level(
+    level: Dict[str, ToolInstaller],
+    fetches: Dict[str, concurrent.futures.Future],
+    reusable_components: Dict[str, ComponentInstallationModel],
+    target_dir: str,
+    installation_summary: InstallationSummary,
+    conan_manager: ConanManager,
+    max_workers: int,
+):
+    pending_installers = {
+        component_key: installer
+        for component_key, installer in level.items()
+        if component_key not in reusable_components
+    }
+    futures = {}
+    if pending_installers:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(len(pending_installers), max_workers)
+        ) as executor:
+            futures = {
+                component_key: executor.submit(
+                    __run_installer, installer, fetches[component_key]
+                )
+                for component_key, installer in pending_installers.items()
+            }
+
+    # Results are applied serially to keep the summary deterministic
+    for component_key in level:
+        if component_key in reusable_components:
+            __logger.info("Component %s is already installed", component_key)
+            installation_summary.add_component(
+                component_key, reusable_components[component_key]
+            )
+            continue
+
+        installation_model = futures[component_key].result()
+        conan_manager.add_profiles_to_component(
+            component_key,
+            installation_model,
+            target_dir,
+        )
+        installation_summary.add_component(component_key, installation_model)
 
 
 @inject
 def __install(
     args,
-    file_manager: FileManager = Provide[Container.file_manager],
-    package_manager: PackageManager = Provide[Container.package_manager],
-    conan_manager: ConanManager = Provide[Container.conan_manager],
-    target_dir: str = Provide[Container.config.target_dir],
+    file_manager: FileManager = Provide["file_manager"],
+    package_manager: PackageManager = Provide["package_manager"],
+    conan_manager: ConanManager = Provide["conan_manager"],
+    target_dir: str = Provide["config.target_dir"],
 ):
-    builder2.loggers.configure("INFO" if not args.quiet else "ERROR")
+    from builder2.installation_summary import InstallationSummary
 
     try:
         toolchain_metadata = __load_toolchain_metadata(args.filename, file_manager)
         installation_summary = InstallationSummary(file_manager)
 
-        # Install globally declared packages
-        package_manager.install_packages(toolchain_metadata.packages)
-
         __install_components(
-            toolchain_metadata.components,
+            toolchain_metadata,
             target_dir,
             installation_summary,
+            file_manager,
+            package_manager,
             conan_manager,
+            args.core_count,
         )
 
         installation_summary.add_environment_variables(
@@ -130,9 +382,7 @@ def __install(
         # Ensure build transient packages are removed before saving the installation summary
         package_manager.cleanup()
 
-        installation_summary.add_packages(
-            list(package_manager.get_installed_packages())
-        )
+        installation_summary.add_packages(package_manager.get_installed_packages())
 
         installation_summary.save(target_dir)
 
@@ -169,7 +419,7 @@ def register(subparsers):
         "--max-cpus",
         dest="core_count",
         type=int,
-        default=os.cpu_count(),
+        default=__CPU_COUNT,
         help="Max core count to be used",
     )
     command_parser.add_argument(
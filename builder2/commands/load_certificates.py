@@ -1,26 +1,27 @@
+from __future__ import annotations
+
 import logging
+import typing
 
 from dependency_injector.wiring import inject, Provide
 
-import builder2.loggers
-from builder2.di import Container
-from builder2.file_manager import FileManager
-from builder2.certificate_manager import CertificateManager
 from builder2.commands import command_commons
 from builder2.exceptions import BuilderException
 
+if typing.TYPE_CHECKING:
+    from builder2.certificate_manager import CertificateManager
+    from builder2.file_manager import FileManager
+
 __logger = logging.getLogger(__name__)
 
 
 @inject
 def __load_certificates(
     args,
-    file_manager: FileManager = Provide[Container.file_manager],
-    certificate_manager: CertificateManager = Provide[Container.certificate_manager],
+    file_manager: FileManager = Provide["file_manager"],
+    certificate_manager: CertificateManager = Provide["certificate_manager"],
 ):
     try:
-        builder2.loggers.configure("INFO" if not args.quiet else "ERROR")
-
         installation_summary = command_commons.get_installation_summary_from_args(
             args, file_manager
         )
@@ -1,5 +1,8 @@
+from __future__ import annotations
+
 import logging
 import os
+import typing
 from typing import Dict
 
 from dependency_injector.wiring import inject, Provide
@@ -7,28 +10,27 @@ from dependency_injector.wiring import inject, Provide
 import builder2.loggers
 from builder2 import constants
 from builder2.commands import command_commons
-from builder2.di import Container
-from builder2.environment_builder import EnvironmentBuilder
 from builder2.exceptions import BuilderException
-from builder2.file_manager import FileManager
+
+if typing.TYPE_CHECKING:
+    from builder2.environment_builder import EnvironmentBuilder
+    from builder2.file_manager import FileManager
 
 __logger = logging.getLogger(__name__)
 
 
 def __generate_vars_content(variables: Dict[str, str]):
     # TODO Assume bash for the moment
-    content = ""
-    for name, value in variables.items():
-        content = f'{content}{name}="{value}"\n'
-        content = f"{content}export {name}\n"
-    return content.strip("\n")
+    return "\n".join(
+        f'{name}="{value}"\nexport {name}' for name, value in variables.items()
+    )
 
 
 @inject
 def __source(
     args,
-    file_manager: FileManager = Provide[Container.file_manager],
-    environment_builder: EnvironmentBuilder = Provide[Container.environment_builder],
+    file_manager: FileManager = Provide["file_manager"],
+    environment_builder: EnvironmentBuilder = Provide["environment_builder"],
 ):
     try:
         builder2.loggers.disable()
@@ -39,11 +41,13 @@ def __source(
         env_vars = environment_builder.build_environment_variables(
             installation_summary, args.generate_vars, append=False
         )
-        source_content = __generate_vars_content(env_vars)
+        source_lines = [__generate_vars_content(env_vars)]
         if args.certs_dir and os.path.exists(args.certs_dir):
-            source_content = f"{source_content}\nbuilder2 load-certificates --quiet --certs {args.certs_dir}"
+            source_lines.append(
+                f"builder2 load-certificates --quiet --certs {args.certs_dir}"
+            )
 
-        print(source_content)
+        print("\n".join(source_lines))
 
     except BuilderException as err:
         command_commons.manage_builder_exceptions(err)
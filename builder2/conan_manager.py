@@ -1,8 +1,11 @@
 import configparser
+import io
 import os.path
+from typing import Dict
 
 import builder2.tools.compilers_support
 from builder2.command_line import CommandRunner
+from builder2.constants import CONAN_PROFILE_TYPES
 from builder2.exceptions import BuilderException
 from builder2.file_manager import FileManager
 from builder2.models.installation_models import ComponentInstallationModel
@@ -13,17 +16,16 @@ from builder2.models.metadata_models import (
 from builder2.utils import replace_non_alphanumeric
 
 
-CONAN_PROFILE_TYPES = ["Debug", "Release"]
-
-
 class ConanManager:
     def __init__(self, file_manager: FileManager, command_runner: CommandRunner):
         self._file_manager = file_manager
         self._command_runner = command_runner
+        # Default libstdc++ of each gcc, as all its profiles share it
+        self.__gcc_libcxx: Dict[str, str] = {}
 
     @staticmethod
     def __prepare_common_profile_file(
-        component_installation: ComponentInstallationModel, release_type
+        component_installation: ComponentInstallationModel,
     ) -> configparser.ConfigParser:
         config = configparser.ConfigParser()
         # Preserve uppercase
@@ -52,7 +54,6 @@ class ConanManager:
         config["settings"][
             "compiler.version"
         ] = component_installation.version.strip().split(".")[0]
-        config["settings"]["build_type"] = release_type
 
         return config
 
@@ -104,12 +105,16 @@ class ConanManager:
         config_parser["env"]["CXX"] = gpp_path
         config_parser["settings"]["compiler"] = "gcc"
 
-        gcc_version_output = self._command_runner.run_process([gcc_path, "-v"])
-        config_parser["settings"]["compiler.libcxx"] = (
-            "libstdc++11"
-            if "--with-default-libstdcxx-abi=new" in gcc_version_output
-            else "libstdc++"
-        )
+        if gcc_path not in self.__gcc_libcxx:
+            gcc_version_output = self._command_runner.run_process(
+                [gcc_path, "-v"], stream=False
+            )
+            self.__gcc_libcxx[gcc_path] = (
+                "libstdc++11"
+                if "--with-default-libstdcxx-abi=new" in gcc_version_output
+                else "libstdc++"
+            )
+        config_parser["settings"]["compiler.libcxx"] = self.__gcc_libcxx[gcc_path]
 
         return config_parser
 
@@ -131,18 +136,21 @@ class ConanManager:
             # Create conan profiles dir if not exists
             self._file_manager.create_file_tree(conan_profiles_path)
 
-            for release_type in CONAN_PROFILE_TYPES:
-                config_parser = self.__prepare_common_profile_file(
-                    component_installation, release_type
+            # Profiles only differ in the build type, so the rest is prepared once
+            config_parser = self.__prepare_common_profile_file(component_installation)
+            if is_clang:
+                config_parser = self.__prepare_clang_profile_file(
+                    component_installation, config_parser
+                )
+            else:
+                config_parser = self.__prepare_gcc_profile_file(
+                    component_installation, config_parser
                 )
-                if is_clang:
-                    config_parser = self.__prepare_clang_profile_file(
-                        component_installation, config_parser
-                    )
-                else:
-                    config_parser = self.__prepare_gcc_profile_file(
-                        component_installation, config_parser
-                    )
+
+            for release_type in CONAN_PROFILE_TYPES:
+                config_parser["settings"]["build_type"] = release_type
+                profile_content = io.StringIO()
+                config_parser.write(profile_content)
 
                 profile_path = os.path.join(
                     conan_profiles_path,
@@ -152,5 +160,6 @@ class ConanManager:
                 component_installation.conan_profiles[
                     release_type.lower()
                 ] = profile_path
-                with open(profile_path, "w") as configfile:
-                    config_parser.write(configfile)
+                self._file_manager.write_text_file(
+                    profile_path, profile_content.getvalue()
+                )
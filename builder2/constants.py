@@ -5,3 +5,4 @@ ENV_VAR_GENERATE_PYTHON_VARS = "BUILDER_GENERATE_PYTHON_VARS"
 SHELL_PROMPT_FORMAT_ENV_VAR = "PS1"
 ENV_VAR_PATH = "PATH"
 ENV_VAR_PYTHONPATH = "PYTHONPATH"
+CONAN_PROFILE_TYPES = ["Debug", "Release"]
@@ -1,7 +1,9 @@
+import collections
+import concurrent.futures
+import functools
 import hashlib
+import mmap
 import os
-import pathlib
-import re
 import typing
 import urllib.parse
 
@@ -10,39 +12,66 @@ from builder2.file_manager import FileManager
 
 
 class CryptographicProvider:
-    __HASH_CHUNK_SIZE = 65536
+    __HASH_CHUNK_SIZE = 1048576
+    __HASH_READ_WORKERS = 8
+    __HASH_READ_AHEAD = 32
+    __HASH_READ_AHEAD_MIN_FILES = 16
+    __HASH_READ_AHEAD_MAX_SIZE = 262144
 
-    __md5_string_regex = re.compile("^[a-fA-F\\d]{32}$")
-    __sha1_string_regex = re.compile("^[a-fA-F\\d]{40}$")
-    __sha256_string_regex = re.compile("^[a-fA-F\\d]{64}$")
-    __sha512_string_regex = re.compile("^[a-fA-F\\d]{128}$")
-    __hex_extract_regex = re.compile("\\s?([a-fA-F\\d]*)\\s?")
+    # Hash algorithm by the length of its hex digest
+    __HASH_ALGORITHMS_BY_HEX_LENGTH = {
+        32: hashlib.md5,
+        40: hashlib.sha1,
+        64: hashlib.sha256,
+        128: hashlib.sha512,
+    }
 
     def __init__(self, file_manager: FileManager):
         self._file_manager = file_manager
 
     def __get_hash_algorithm_and_value(self, hash_str: str):
-        match = self.__hex_extract_regex.search(hash_str)
-        hex_string = match.group(1) if match else None
-        if not hex_string:
+        # Checksum files usually have the hash followed by the file name
+        hash_parts = hash_str.split(maxsplit=1)
+        hex_string = hash_parts[0] if hash_parts else None
+        try:
+            bytes.fromhex(hex_string)
+        except (TypeError, ValueError):
             raise BuilderException(f"Cannot infer hash string from {hash_str}")
-        if self.__md5_string_regex.match(hex_string):
-            return hashlib.md5(), hex_string
-        if self.__sha1_string_regex.match(hex_string):
-            return hashlib.sha1(), hex_string
-        if self.__sha256_string_regex.match(hex_string):
-            return hashlib.sha256(), hex_string
-        if self.__sha512_string_regex.match(hex_string):
-            return hashlib.sha512(), hex_string
 
-        raise BuilderException(f"Cannot infer hash algorithm for {hash_str}")
+        algorithm = self.__HASH_ALGORITHMS_BY_HEX_LENGTH.get(len(hex_string))
+        if not algorithm:
+            raise BuilderException(f"Cannot infer hash algorithm for {hash_str}")
+        return algorithm(), hex_string
 
     def add_file_to_hash(self, path: typing.Union[str, os.PathLike], algorithm):
         with open(path, "rb") as file:
-            for chunk in iter(lambda: file.read(self.__HASH_CHUNK_SIZE), b""):
-                algorithm.update(chunk)
+            if not self.__add_mapped_file_to_hash(file, algorithm):
+                self.__add_buffered_file_to_hash(file, algorithm)
         return
 
+    def __add_buffered_file_to_hash(self, file: typing.BinaryIO, algorithm):
+        # A single buffer is reused for all the chunks
+        buffer = bytearray(self.__HASH_CHUNK_SIZE)
+        with memoryview(buffer) as view:
+            read_size = file.readinto(buffer)
+            while read_size:
+                algorithm.update(view[:read_size])
+                read_size = file.readinto(buffer)
+
+    @staticmethod
+    def __add_mapped_file_to_hash(file: typing.BinaryIO, algorithm) -> bool:
+        # Hashing the whole mapped file in a single update lets the hash run
+        # without going back to Python while the kernel pages the file in
+        try:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mapped_file.madvise(mmap.MADV_SEQUENTIAL)
+                algorithm.update(mapped_file)
+            return True
+        except (OSError, ValueError):
+            # Empty files and some special files cannot be mapped
+            return False
+
     def add_files_to_hash(
         self,
         paths: typing.List[typing.Union[str, os.PathLike]],
@@ -50,17 +79,70 @@ class CryptographicProvider:
         add_names: bool = True,
         names_base: typing.Union[str, os.PathLike] = None,
     ):
-        names_base = pathlib.Path(names_base) if names_base else None
-        abs_names = {
-            name if names_base is None else names_base.joinpath(name): name
-            for name in sorted(paths)
-        }
-        for abs_name, original_name in abs_names.items():
-            if add_names:
-                algorithm.update(
-                    str(original_name if names_base else abs_name).encode("utf-8")
+        sorted_paths = sorted(paths)
+        # Keyed by the path to read, so each file is only hashed once
+        if names_base:
+            base_path = os.fspath(names_base)
+            abs_names = {
+                os.path.join(base_path, name): str(name) for name in sorted_paths
+            }
+        else:
+            abs_names = {name: str(name) for name in sorted_paths}
+        # A few files are not worth handing over to the read threads
+        if len(abs_names) < self.__HASH_READ_AHEAD_MIN_FILES:
+            for abs_name, name in abs_names.items():
+                if add_names:
+                    algorithm.update(name.encode("utf-8"))
+                self.add_file_to_hash(abs_name, algorithm)
+            return
+
+        # Files are read ahead concurrently but hashed in order, so the digest is
+        # still the one of the concatenated names and contents
+        executor = self.__get_read_executor()
+        pending_reads = collections.deque()
+        for abs_name, name in abs_names.items():
+            pending_reads.append(
+                (abs_name, name, executor.submit(self.__read_small_file, abs_name))
+            )
+            if len(pending_reads) >= self.__HASH_READ_AHEAD:
+                self.__add_read_file_to_hash(
+                    *pending_reads.popleft(), algorithm, add_names
                 )
-            self.add_file_to_hash(abs_name, algorithm)
+        while pending_reads:
+            self.__add_read_file_to_hash(*pending_reads.popleft(), algorithm, add_names)
+
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def __get_read_executor(cls) -> concurrent.futures.ThreadPoolExecutor:
+        # Shared by all the providers and calls, instead of starting and joining
+        # the read threads for each set of files
+        return concurrent.futures.ThreadPoolExecutor(
+            max_workers=cls.__HASH_READ_WORKERS
+        )
+
+    def __read_small_file(
+        self, path: typing.Union[str, os.PathLike]
+    ) -> typing.Optional[bytes]:
+        # Big files are left to be hashed without loading them in memory
+        if os.path.getsize(path) > self.__HASH_READ_AHEAD_MAX_SIZE:
+            return None
+        return self._file_manager.read_file_as_bytes(path)
+
+    def __add_read_file_to_hash(
+        self,
+        path: typing.Union[str, os.PathLike],
+        name: str,
+        read_future: concurrent.futures.Future,
+        algorithm,
+        add_names: bool,
+    ):
+        if add_names:
+            algorithm.update(name.encode("utf-8"))
+        content = read_future.result()
+        if content is None:
+            self.add_file_to_hash(path, algorithm)
+        else:
+            algorithm.update(content)
 
     def compute_file_sha1(self, path: typing.Union[str, os.PathLike]) -> str:
         algorithm = hashlib.sha1()
@@ -79,22 +161,32 @@ class CryptographicProvider:
         )
         return algorithm.hexdigest()
 
-    def validate_file_hash(
-        self, file_path: typing.Union[str, os.PathLike], hash_or_url_string: str
-    ):
+    def get_expected_hash(self, hash_or_url_string: str):
         parse_result = urllib.parse.urlparse(hash_or_url_string)
         if parse_result.netloc and parse_result.scheme:
             expected_hash = self._file_manager.get_remote_file_content(
                 hash_or_url_string
             )
-            algorithm, hash_value = self.__get_hash_algorithm_and_value(expected_hash)
-        else:
-            algorithm, hash_value = self.__get_hash_algorithm_and_value(
-                hash_or_url_string
-            )
+            return self.__get_hash_algorithm_and_value(expected_hash)
+        return self.__get_hash_algorithm_and_value(hash_or_url_string)
 
-        file_hash = self.add_file_to_hash(file_path, algorithm)
-        if file_hash != hash_value:
+    @staticmethod
+    def validate_hash(
+        file_path: typing.Union[str, os.PathLike], algorithm, hash_value: str
+    ):
+        file_hash = algorithm.hexdigest()
+        if file_hash != hash_value.lower():
             raise BuilderException(
-                f"File {file_hash} hash is not the expected one {hash_value}"
+                f"File {file_path} hash {file_hash} is not the expected one "
+                f"{hash_value}"
             )
+
+    def validate_file_hash(
+        self, file_path: typing.Union[str, os.PathLike], hash_or_url_string: str
+    ):
+        algorithm, hash_value = self.get_expected_hash(hash_or_url_string)
+
+        # A fresh hash object already holds the digest of an empty file
+        if os.path.getsize(file_path) != 0:
+            self.add_file_to_hash(file_path, algorithm)
+        self.validate_hash(file_path, algorithm, hash_value)
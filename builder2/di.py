@@ -71,8 +71,8 @@ class Container(containers.DeclarativeContainer):
 
     environment_builder = providers.Singleton(EnvironmentBuilder)
 
-    maven_installer_factory = providers.Factory(
-        MavenInstaller,
+    # Dependencies shared by all the installers
+    __INSTALLER_DEPENDENCIES = dict(
         file_manager=file_manager,
         cryptographic_provider=cryptographic_provider,
         command_runner=command_runner,
@@ -82,129 +82,60 @@ class Container(containers.DeclarativeContainer):
         python_manager=python_manager,
     )
 
+    maven_installer_factory = providers.Factory(
+        MavenInstaller, **__INSTALLER_DEPENDENCIES
+    )
+
     jdk_installer_factory = providers.Factory(
         JdkInstaller,
-        file_manager=file_manager,
-        cryptographic_provider=cryptographic_provider,
-        command_runner=command_runner,
-        package_manager=package_manager,
         java_tools=java_tools,
-        core_count=config.core_count,
-        time_multiplier=config.timout_mult,
-        python_manager=python_manager,
+        **__INSTALLER_DEPENDENCIES,
     )
 
     gcc_sources_installer_factory = providers.Factory(
         GccSourcesInstaller,
-        file_manager=file_manager,
-        cryptographic_provider=cryptographic_provider,
-        command_runner=command_runner,
-        package_manager=package_manager,
         compilers_support=compilers_support,
-        core_count=config.core_count,
-        time_multiplier=config.timout_mult,
-        python_manager=python_manager,
+        **__INSTALLER_DEPENDENCIES,
     )
 
     cmake_sources_installer_factory = providers.Factory(
-        CMakeSourcesInstaller,
-        file_manager=file_manager,
-        cryptographic_provider=cryptographic_provider,
-        command_runner=command_runner,
-        package_manager=package_manager,
-        core_count=config.core_count,
-        time_multiplier=config.timout_mult,
-        python_manager=python_manager,
+        CMakeSourcesInstaller, **__INSTALLER_DEPENDENCIES
     )
 
     cppcheck_sources_installer_factory = providers.Factory(
-        CppCheckSourcesInstaller,
-        file_manager=file_manager,
-        cryptographic_provider=cryptographic_provider,
-        command_runner=command_runner,
-        package_manager=package_manager,
-        core_count=config.core_count,
-        time_multiplier=config.timout_mult,
-        python_manager=python_manager,
+        CppCheckSourcesInstaller, **__INSTALLER_DEPENDENCIES
     )
 
     download_only_sources_installer_factory = providers.Factory(
-        DownloadOnlySourcesInstaller,
-        file_manager=file_manager,
-        cryptographic_provider=cryptographic_provider,
-        command_runner=command_runner,
-        package_manager=package_manager,
-        core_count=config.core_count,
-        time_multiplier=config.timout_mult,
-        python_manager=python_manager,
+        DownloadOnlySourcesInstaller, **__INSTALLER_DEPENDENCIES
     )
 
     download_only_compiler_installer_factory = providers.Factory(
         DownloadOnlyCompilerInstaller,
-        file_manager=file_manager,
-        cryptographic_provider=cryptographic_provider,
-        command_runner=command_runner,
-        package_manager=package_manager,
         compilers_support=compilers_support,
-        core_count=config.core_count,
-        time_multiplier=config.timout_mult,
-        python_manager=python_manager,
+        **__INSTALLER_DEPENDENCIES,
     )
 
     valgrind_sources_installer_factory = providers.Factory(
-        ValgrindSourcesInstaller,
-        file_manager=file_manager,
-        cryptographic_provider=cryptographic_provider,
-        command_runner=command_runner,
-        package_manager=package_manager,
-        core_count=config.core_count,
-        time_multiplier=config.timout_mult,
-        python_manager=python_manager,
+        ValgrindSourcesInstaller, **__INSTALLER_DEPENDENCIES
     )
 
     clang_sources_installer_factory = providers.Factory(
         ClangSourcesInstaller,
-        file_manager=file_manager,
-        cryptographic_provider=cryptographic_provider,
-        command_runner=command_runner,
-        package_manager=package_manager,
         compilers_support=compilers_support,
-        core_count=config.core_count,
-        time_multiplier=config.timout_mult,
-        python_manager=python_manager,
+        **__INSTALLER_DEPENDENCIES,
     )
 
     tool_source_installer_factory = providers.Factory(
-        ToolSourceInstaller,
-        file_manager=file_manager,
-        cryptographic_provider=cryptographic_provider,
-        command_runner=command_runner,
-        package_manager=package_manager,
-        core_count=config.core_count,
-        time_multiplier=config.timout_mult,
-        python_manager=python_manager,
+        ToolSourceInstaller, **__INSTALLER_DEPENDENCIES
     )
 
     ansible_installer_factory = providers.Factory(
-        AnsibleInstaller,
-        file_manager=file_manager,
-        cryptographic_provider=cryptographic_provider,
-        command_runner=command_runner,
-        package_manager=package_manager,
-        core_count=config.core_count,
-        time_multiplier=config.timout_mult,
-        python_manager=python_manager,
+        AnsibleInstaller, **__INSTALLER_DEPENDENCIES
     )
 
     ansible_collection_installer_factory = providers.Factory(
-        AnsibleCollectionInstaller,
-        file_manager=file_manager,
-        cryptographic_provider=cryptographic_provider,
-        command_runner=command_runner,
-        package_manager=package_manager,
-        core_count=config.core_count,
-        time_multiplier=config.timout_mult,
-        python_manager=python_manager,
+        AnsibleCollectionInstaller, **__INSTALLER_DEPENDENCIES
     )
 
     tool_installers = providers.Aggregate(
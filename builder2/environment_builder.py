@@ -5,6 +5,7 @@ import typing
 from builder2 import constants
 from builder2.utils import replace_non_alphanumeric
 from builder2.installation_summary import InstallationSummary
+from builder2.models.installation_models import ComponentInstallationModel
 
 
 class EnvironmentBuilder:
@@ -32,22 +33,29 @@ class EnvironmentBuilder:
 
     @staticmethod
     def __insert_into_list_var(
-        envs: typing.Dict[str, str], name: str, value: str
+        envs: typing.Dict[str, str], name: str, *values: str
     ) -> typing.Dict[str, str]:
-        content = envs.get(name, "").strip(os.pathsep).split(os.pathsep)
-        content.insert(0, str(value))
-        if content:
-            # use a dict to remove duplications while preserving the order
-            envs.update(
-                {name: os.pathsep.join(list(dict.fromkeys(content))).strip(os.pathsep)}
-            )
+        # Each value is prepended, so the last given value ends up first
+        content = [str(value) for value in reversed(values)]
+        content.extend(envs.get(name, "").strip(os.pathsep).split(os.pathsep))
+        # use a dict to remove duplications while preserving the order
+        envs[name] = os.pathsep.join(dict.fromkeys(content)).strip(os.pathsep)
         return envs
 
     @classmethod
-    def __set_paths(cls, installation_summary, envs: typing.Dict[str, str]):
-        for component_installation in installation_summary.get_components().values():
-            for paths in component_installation.path_dirs:
-                cls.__insert_into_list_var(envs, constants.ENV_VAR_PATH, paths)
+    def __set_paths(
+        cls,
+        components: typing.Dict[str, ComponentInstallationModel],
+        envs: typing.Dict[str, str],
+    ):
+        # Build the variable once with all the paths instead of re-splitting
+        # and re-joining the whole value for each path
+        paths = [
+            path
+            for component_installation in components.values()
+            for path in component_installation.path_dirs
+        ]
+        cls.__insert_into_list_var(envs, constants.ENV_VAR_PATH, *paths)
 
     @classmethod
     def __build_component_generated_variables(
@@ -143,20 +151,17 @@ class EnvironmentBuilder:
     def __set_python_vars(
         cls,
         installation_summary: InstallationSummary,
+        components: typing.Dict[str, ComponentInstallationModel],
         envs: typing.Dict[str, str],
     ):
         base_path = pathlib.Path(installation_summary.path).parent
-        component_envs = {
-            base_path.joinpath(name, ".venv"): data
-            for name, data in installation_summary.get_components().items()
-            if data.configuration.add_to_path
-        }
 
         # Add the global venv
         cls.__set_python_env_vars(envs, base_path.joinpath(".venv"))
 
-        for path in component_envs.keys():
-            cls.__set_python_env_vars(envs, path)
+        for name, data in components.items():
+            if data.configuration.add_to_path:
+                cls.__set_python_env_vars(envs, base_path.joinpath(name, ".venv"))
 
     @classmethod
     def __set_python_env_vars(cls, envs: typing.Dict[str, str], path: pathlib.Path):
@@ -177,14 +182,21 @@ class EnvironmentBuilder:
         generate_variables: bool,
         append: bool = True,
     ):
-        variables = os.environ.copy() if append else {}
-        for installation in installation_summary.get_components().values():
-            variables.update(installation.environment_vars)
-        variables.update(installation_summary.get_environment_variables())
+        components = installation_summary.get_components()
+        component_variables = {}
+        for installation in components.values():
+            component_variables.update(installation.environment_vars)
+        component_variables.update(installation_summary.get_environment_variables())
+
+        # Merge with the current environment in a single pass, once all the
+        # component variables are known
+        variables = (
+            {**os.environ, **component_variables} if append else component_variables
+        )
 
         # Replace PATH with its value plus the paths in the summary
-        cls.__set_paths(installation_summary, variables)
-        cls.__set_python_vars(installation_summary, variables)
+        cls.__set_paths(components, variables)
+        cls.__set_python_vars(installation_summary, components, variables)
 
         # Add generated environment variables only if desired
         if generate_variables:
@@ -194,15 +206,13 @@ class EnvironmentBuilder:
 
         # If the builder installation path env var is not present add it
         # to simplify other commands after bootstrapped
-        if constants.ENV_VAR_INSTALLATION_SUMMARY not in variables:
-            variables[constants.ENV_VAR_INSTALLATION_SUMMARY] = (
-                installation_summary.path
-            )
+        variables.setdefault(
+            constants.ENV_VAR_INSTALLATION_SUMMARY, installation_summary.path
+        )
 
         # Add a prefix to the shell to make obvious that the shell is bootstrapped
-        if constants.SHELL_PROMPT_FORMAT_ENV_VAR in variables:
-            variables[constants.SHELL_PROMPT_FORMAT_ENV_VAR] = (
-                f"[b] {variables[constants.SHELL_PROMPT_FORMAT_ENV_VAR]}"
-            )
+        prompt_format = variables.get(constants.SHELL_PROMPT_FORMAT_ENV_VAR)
+        if prompt_format is not None:
+            variables[constants.SHELL_PROMPT_FORMAT_ENV_VAR] = f"[b] {prompt_format}"
 
         return variables
@@ -1,3 +1,4 @@
+import collections
 import dataclasses
 import io
 import json
@@ -7,6 +8,7 @@ import pathlib
 import shutil
 import stat
 import tarfile
+import threading
 import typing
 import urllib.request
 import urllib.error
@@ -16,6 +18,11 @@ from typing import List
 import requests
 import yaml
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from builder2.exceptions import BuilderException
 
 __logger = logging.getLogger()
@@ -51,6 +58,9 @@ class FileManager:
             self.__count = pos
             return io.FileIO.read(self, size)
 
+    __DOWNLOAD_CHUNK_SIZE = 65536
+    __EXECUTABLE_MODE_BITS = stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+
     def __init__(self):
         self._logger = logging.getLogger(self.__class__.__name__)
 
@@ -96,20 +106,25 @@ class FileManager:
 
     @staticmethod
     def file_is_executable(path: typing.Union[str, os.PathLike]) -> bool:
-        executable_path = pathlib.Path(path) if isinstance(path, str) else path
-        return (
-            executable_path.exists()
-            and executable_path.is_file()
-            and bool(
-                executable_path.stat().st_mode
-                & (stat.S_IEXEC | stat.S_IXGRP | stat.S_IXOTH)
-            )
-        )
+        # A single stat answers existence, type and permissions
+        try:
+            mode = os.stat(path).st_mode
+        except (OSError, ValueError):
+            return False
+        return stat.S_ISREG(mode) and bool(mode & FileManager.__EXECUTABLE_MODE_BITS)
 
-    @staticmethod
-    def read_file_as_bytes(path: typing.Union[str, os.PathLike]) -> bytes:
-        with open(path, "rb") as file:
-            return file.read()
+    @classmethod
+    def read_file_as_bytes(
+        cls, path: typing.Union[str, os.PathLike], ignore_failure: bool = False
+    ) -> typing.Optional[bytes]:
+        try:
+            # Whole file reads don't benefit from buffering. Raw reads are sized from fstat
+            with open(path, "rb", buffering=0) as file:
+                return file.readall()
+        except FileNotFoundError as err:
+            if not ignore_failure:
+                raise err
+        return None
 
     @classmethod
     def read_file_as_text(
@@ -161,8 +176,21 @@ class FileManager:
     def write_as_json(
         cls, path: typing.Union[str, os.PathLike], content: typing.Dict[str, typing.Any]
     ):
-        with open(path, "w") as file:
-            json.dump(content, file, indent=2, cls=cls.EnhancedJSONEncoder)
+        if orjson:
+            # Dataclasses are natively serialized by orjson
+            with open(path, "wb") as file:
+                file.write(
+                    orjson.dumps(
+                        content, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+                    )
+                )
+            return
+        # Same output as orjson: UTF-8 and a trailing newline
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(
+                content, file, indent=2, ensure_ascii=False, cls=cls.EnhancedJSONEncoder
+            )
+            file.write("\n")
 
     @staticmethod
     def write_binary_file(path: typing.Union[str, os.PathLike], content: bytes):
@@ -187,7 +215,10 @@ class FileManager:
     def read_json_file(
         path: typing.Union[str, os.PathLike]
     ) -> typing.Dict[str, typing.Any]:
-        with open(path) as file:
+        if orjson:
+            with open(path, "rb") as file:
+                return orjson.loads(file.read())
+        with open(path, encoding="utf-8") as file:
             return json.load(file)
 
     @staticmethod
@@ -214,14 +245,61 @@ class FileManager:
             )
         return files
 
-    def download_file(self, url: str, dst_file: typing.Union[str, os.PathLike]):
+    @staticmethod
+    def search_get_executable_files(path: str) -> List[str]:
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"Search path {path} not found")
+
+        # Breadth first, so files closer to the search path come first
+        executables = []
+        pending_dirs = collections.deque([os.path.abspath(path)])
+        while pending_dirs:
+            with os.scandir(pending_dirs.popleft()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending_dirs.append(entry.path)
+                    # Entries cache their stat result, no extra syscalls needed
+                    elif (
+                        entry.is_file()
+                        and entry.stat().st_mode & FileManager.__EXECUTABLE_MODE_BITS
+                    ):
+                        executables.append(entry.path)
+        return executables
+
+    @staticmethod
+    def search_get_files_by_extension(
+        path: str, extensions: typing.Tuple[str, ...]
+    ) -> List[str]:
+        try:
+            with os.scandir(path) as entries:
+                return sorted(
+                    entry.path
+                    for entry in entries
+                    if entry.name.endswith(extensions) and entry.is_file()
+                )
+        except NotADirectoryError as err:
+            raise FileNotFoundError(f"Search path {path} not found") from err
+
+    def download_file(
+        self,
+        url: str,
+        dst_file: typing.Union[str, os.PathLike],
+        hash_algorithms: typing.Optional[typing.List] = None,
+        cancel_event: typing.Optional[threading.Event] = None,
+    ):
         self._logger.info("Start download of %s", url)
         resp = requests.get(url, stream=True)
         total = int(resp.headers.get("content-length", 0))
         received = 0
         last_print = 0
         with open(dst_file, "wb") as file:
-            for data in resp.iter_content(chunk_size=1024):
+            for data in resp.iter_content(chunk_size=self.__DOWNLOAD_CHUNK_SIZE):
+                if cancel_event and cancel_event.is_set():
+                    resp.close()
+                    raise BuilderException(f"Download of {url} cancelled")
+                # Hash while the chunk is still in memory to avoid reading it back
+                for algorithm in hash_algorithms or []:
+                    algorithm.update(data)
                 received = received + file.write(data)
                 if total != 0 and (received - last_print) > 0.2 * total:
                     last_print = received
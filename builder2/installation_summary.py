@@ -84,14 +84,21 @@ class InstallationSummary:
         self.__components[tool_key] = tool_summary
 
     def add_packages(self, package: List[PackageInstallationModel]):
-        self.__packages.extend(package)
+        # Packages carried over from a previous installation may be reported
+        # again by the package manager
+        known_packages = set(self.__packages)
+        self.__packages.extend(
+            element for element in package if element not in known_packages
+        )
+
+    def get_packages(self) -> List[PackageInstallationModel]:
+        return self.__packages
 
     def add_environment_variable(self, name: str, value: str):
         self.__environment_vars[name] = value
 
     def add_environment_variables(self, variables: Dict[str, str]):
-        for key, value in variables.items():
-            self.add_environment_variable(key, value)
+        self.__environment_vars.update(variables)
 
     def get_environment_variables(self) -> Dict[str, str]:
         return self.__environment_vars
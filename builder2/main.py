@@ -1,6 +1,6 @@
 import configargparse
 
-from builder2.di import container_instance
+import builder2.loggers
 from builder2 import __version__
 from builder2.commands import bootstrap, install, load_certificates, get, source
 
@@ -22,6 +22,14 @@ def __build_args_parser():
 def main():
     args = __build_args_parser().parse_args()
 
+    # Commands that write to stdout, like source, disable logging by themselves
+    if "quiet" in args:
+        builder2.loggers.configure("INFO" if not args.quiet else "ERROR")
+
+    # Imported once args are parsed, so --help and --version don't load
+    # all the services registered in the container
+    from builder2.di import container_instance
+
     container_instance.config.from_dict(args.__dict__)
     container_instance.wire(
         modules=[
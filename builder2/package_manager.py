@@ -1,5 +1,6 @@
 import dataclasses
 import logging
+import threading
 import typing
 
 from builder2.command_line import CommandRunner
@@ -25,6 +26,8 @@ class PackageManager:
         self._apt_update_ran = False
         self.__installed_packages = {}
         self.__uninstalled_packages = {}
+        # apt holds a system wide lock, so packages are installed one at a time
+        self.__lock = threading.Lock()
 
     def install_pip_package(
         self, package: PipPackageInstallationConfiguration
@@ -44,22 +47,26 @@ class PackageManager:
             self._command_runner.run_process(["apt-get", "update"])
             self._apt_update_ran = True
 
-    def __install_apt_package(
-        self, package: AptPackageInstallationConfiguration
-    ) -> PackageInstallationModel:
+    def __install_apt_packages(
+        self, packages: typing.List[AptPackageInstallationConfiguration]
+    ):
         self.__update_apt_sources()
 
-        package_to_install = [
+        # A single apt run resolves and fetches all the packages at once
+        packages_to_install = [
             f"{package.name}={package.version}" if package.version else package.name
+            for package in packages
         ]
         self._command_runner.run_process(
-            ["apt-get", "install", "-y"] + package_to_install
+            ["apt-get", "install", "-y"] + packages_to_install
         )
 
-        self.__run_post_commands(package.post_installation)
-        return AptPackageInstallationModel(
-            package.name, package.version, configuration=package
-        )
+        for package in packages:
+            self.__run_post_commands(package.post_installation)
+            key = self.__build_package_key(package)
+            self.__installed_packages[key] = AptPackageInstallationModel(
+                package.name, package.version, configuration=package
+            )
 
     def __cleanup_apt_orphans(self):
         if any(
@@ -86,6 +93,15 @@ class PackageManager:
         return type(package), package.name, package.version
 
     def install_packages(self, packages):
+        with self.__lock:
+            self.__install_packages(packages)
+
+    def __install_packages(self, packages):
+        pending_packages = {}
+        # Consecutive packages of the same type are installed together, but the
+        # declared order between apt and pip packages is kept, as a package may
+        # need the ones declared before it
+        batches = []
         for package in packages:
             key = self.__build_package_key(package)
             # Check if transient and skip as is already installed packages
@@ -103,15 +119,34 @@ class PackageManager:
 
                 continue
 
-            if isinstance(package, PipPackageInstallationConfiguration):
-                package_install = self.install_pip_package(package)
-            elif isinstance(package, AptPackageInstallationConfiguration):
-                package_install = self.__install_apt_package(package)
-            else:
+            package_type = type(package)
+            if package_type not in (
+                PipPackageInstallationConfiguration,
+                AptPackageInstallationConfiguration,
+            ):
                 raise BuilderException(
-                    f"unsupported package type {type(package).__name__}"
+                    f"unsupported package type {package_type.__name__}"
+                )
+
+            # Same rule as above for packages requested twice in the same call
+            if key in pending_packages:
+                if not package.build_transient:
+                    pending_packages[key] = package
+                continue
+
+            pending_packages[key] = package
+            if not batches or batches[-1][0] is not package_type:
+                batches.append((package_type, []))
+            batches[-1][1].append(key)
+
+        for package_type, keys in batches:
+            if package_type is AptPackageInstallationConfiguration:
+                self.__install_apt_packages([pending_packages[key] for key in keys])
+                continue
+            for key in keys:
+                self.__installed_packages[key] = self.install_pip_package(
+                    pending_packages[key]
                 )
-            self.__installed_packages[key] = package_install
 
     def cleanup(self):
         transients = [
@@ -7,6 +7,7 @@ import pathlib
 import shutil
 import sys
 import tempfile
+import threading
 import typing
 from os import PathLike
 
@@ -32,6 +33,9 @@ class PythonManager:
         self.__venv_path = pathlib.Path(target_path).resolve().joinpath(".venv")
         self.__logger = logging.getLogger()
         self.__venvs: typing.Dict[str, "PythonManager"] = {}
+        # Components can be installed concurrently, but pip cannot run twice in
+        # the same environment. Reentrant as the venv is lazily created
+        self.__lock = threading.RLock()
 
     def __get_binary(self):
         binary = self.__venv_path.joinpath("bin", "python3")
@@ -79,16 +83,18 @@ class PythonManager:
         return env
 
     def run_module(self, module: str, *args, cwd: str = None):
-        self.__command_runner.run_process(
-            [str(self.__get_binary()), "-m", module] + list(args),
-            cwd=cwd,
-        )
+        with self.__lock:
+            self.__command_runner.run_process(
+                [str(self.__get_binary()), "-m", module] + list(args),
+                cwd=cwd,
+            )
 
     def run_module_check_output(self, module: str, *args, cwd: str = None) -> str:
-        return self.__command_runner.check_output(
-            [str(self.__get_binary()), "-m", module] + list(args),
-            cwd=cwd,
-        )
+        with self.__lock:
+            return self.__command_runner.check_output(
+                [str(self.__get_binary()), "-m", module] + list(args),
+                cwd=cwd,
+            )
 
     def install_pip_package(
         self, pip_package: PipPackageInstallationConfiguration
@@ -15,67 +15,90 @@ EXEC_NAME_CLANG_FORMAT = "clang-format"
 class CompilersSupport:
     __COMMON_COMPILER_BINARY_OPTIONS = ["-v", "-dumpmachine", "-dumpversion"]
     __CLANG_TOOLS_BINARY_OPTIONS = ["--version"]
+    __NON_BINARY_EXTENSIONS = (".py", ".perl", ".sh", ".bash", ".el", ".applescript")
+    # Info options answer immediately, a slow binary is not a usable compiler
+    __PROBE_TIMEOUT = 5
 
     def __init__(self, file_manager: FileManager, command_runner: CommandRunner):
         self._file_manager = file_manager
         self._command_runner = command_runner
+        self.__verified_executables = {}
 
     def __verify_is_gcc_clang_executable(self, binary_path, must_support_options):
-        is_ok = False
+        # Symlinks to an already probed binary are not probed again
+        real_path = os.path.realpath(binary_path)
+        probe_key = (
+            real_path,
+            os.stat(real_path).st_mtime_ns,
+            tuple(must_support_options),
+        )
+        if probe_key not in self.__verified_executables:
+            self.__verified_executables[probe_key] = self.__probe_executable(
+                binary_path, must_support_options
+            )
+        return self.__verified_executables[probe_key]
+
+    def __probe_executable(self, binary_path, must_support_options):
+        # Compilers accept all the info options in a single call, while other
+        # binaries with similar names (gcc-ar, gcc-nm...) reject them
         try:
-            for option in must_support_options:
-                result = self._command_runner.run_process(
-                    [binary_path, option], timeout=20, silent=True
+            return (
+                self._command_runner.run_process(
+                    [binary_path] + must_support_options,
+                    timeout=self.__PROBE_TIMEOUT,
+                    silent=True,
                 )
-
-                is_ok = result != ""
-                if not is_ok:
-                    return False
+                != ""
+            )
         except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError):
             return False
-        return is_ok
 
-    def get_compiler_binary_path(
-        self, base_dir, target_name, ignore=None, must_support=None
+    def __find_compiler_binary_path(
+        self, executables, target_name, ignore=None, must_support=None
     ):
         ignore_names = ignore if ignore else []
         last_exec = None
-        for path in self._file_manager.search_get_files_by_pattern(
-            base_dir, [f"*{target_name}*"], recursive=True
-        ):
-            exec_path = str(path.absolute())
+        for exec_path in executables:
+            name = os.path.basename(exec_path)
+            stem = os.path.splitext(name)[0]
+            # Cheap name checks go first, so only real candidates are probed
             if (
-                not path.name.endswith(
-                    (".py", ".perl", ".sh", ".bash", ".el", ".applescript")
-                )
-                and self._file_manager.file_is_executable(exec_path)
-                # Discard ignored executables
-                and all(
-                    (to_ignore_name not in path.stem) for to_ignore_name in ignore_names
-                )
+                target_name in name
                 and (
-                    path.stem.endswith(f"-{target_name}")
-                    or path.stem.startswith(f"{target_name}-")
-                    or path.stem == target_name
+                    stem == target_name
+                    or stem.endswith(f"-{target_name}")
+                    or stem.startswith(f"{target_name}-")
                 )
+                and not name.endswith(self.__NON_BINARY_EXTENSIONS)
+                # Discard ignored executables
+                and all(to_ignore_name not in stem for to_ignore_name in ignore_names)
                 and (
-                    must_support
-                    and self.__verify_is_gcc_clang_executable(exec_path, must_support)
-                    or not must_support
+                    not must_support
+                    or self.__verify_is_gcc_clang_executable(exec_path, must_support)
                 )
             ):
                 # Many times gcc has prefixed names. Try to spot the shortest one
-                if not last_exec or len(os.path.basename(exec_path)) < len(
-                    os.path.basename(last_exec)
-                ):
+                if not last_exec or len(name) < len(os.path.basename(last_exec)):
                     last_exec = exec_path
 
         return last_exec
 
+    def get_compiler_binary_path(
+        self, base_dir, target_name, ignore=None, must_support=None
+    ):
+        return self.__find_compiler_binary_path(
+            self._file_manager.search_get_executable_files(base_dir),
+            target_name,
+            ignore=ignore,
+            must_support=must_support,
+        )
+
     def get_clang_wellknown_paths(self, target_dir):
+        # All the tools are searched in a single scan of the directory
+        executables = self._file_manager.search_get_executable_files(target_dir)
         wellknown_paths = {}
-        clang_path = self.get_compiler_binary_path(
-            target_dir,
+        clang_path = self.__find_compiler_binary_path(
+            executables,
             EXEC_NAME_CLANG_CC,
             ignore=[EXEC_NAME_CLANG_CXX],
             must_support=self.__COMMON_COMPILER_BINARY_OPTIONS,
@@ -83,24 +106,24 @@ class CompilersSupport:
         if clang_path:
             wellknown_paths[EXEC_NAME_CLANG_CC] = clang_path
 
-        clang_cpp_path = self.get_compiler_binary_path(
-            target_dir,
+        clang_cpp_path = self.__find_compiler_binary_path(
+            executables,
             EXEC_NAME_CLANG_CXX,
             must_support=self.__COMMON_COMPILER_BINARY_OPTIONS,
         )
         if clang_cpp_path:
             wellknown_paths[EXEC_NAME_CLANG_CXX] = clang_cpp_path
 
-        clang_format_path = self.get_compiler_binary_path(
-            target_dir,
+        clang_format_path = self.__find_compiler_binary_path(
+            executables,
             EXEC_NAME_CLANG_FORMAT,
             must_support=self.__CLANG_TOOLS_BINARY_OPTIONS,
         )
         if clang_format_path:
             wellknown_paths[EXEC_NAME_CLANG_FORMAT] = clang_format_path
 
-        clang_tidy_path = self.get_compiler_binary_path(
-            target_dir,
+        clang_tidy_path = self.__find_compiler_binary_path(
+            executables,
             EXEC_NAME_CLANG_TIDY,
             must_support=self.__CLANG_TOOLS_BINARY_OPTIONS,
         )
@@ -110,17 +133,19 @@ class CompilersSupport:
         return wellknown_paths
 
     def get_gcc_wellknown_paths(self, target_dir):
+        # All the tools are searched in a single scan of the directory
+        executables = self._file_manager.search_get_executable_files(target_dir)
         wellknown_paths = {}
-        gcc_path = self.get_compiler_binary_path(
-            target_dir,
+        gcc_path = self.__find_compiler_binary_path(
+            executables,
             EXEC_NAME_GCC_CC,
             ignore=[EXEC_NAME_GCC_CXX],
             must_support=self.__COMMON_COMPILER_BINARY_OPTIONS,
         )
         if gcc_path:
             wellknown_paths[EXEC_NAME_GCC_CC] = gcc_path
-        gpp_path = self.get_compiler_binary_path(
-            target_dir,
+        gpp_path = self.__find_compiler_binary_path(
+            executables,
             EXEC_NAME_GCC_CXX,
             must_support=self.__COMMON_COMPILER_BINARY_OPTIONS,
         )
@@ -1,4 +1,5 @@
 import abc
+import hashlib
 import logging
 import os
 import pathlib
@@ -6,6 +7,7 @@ import re
 import stat
 import sys
 import tempfile
+import threading
 import typing
 from urllib.parse import urlparse
 
@@ -36,6 +38,9 @@ class ToolInstaller(metaclass=abc.ABCMeta):
         self._config = args[1]
         self._installation_base = args[2]
         self._temp_dir = None
+        # Sources may be fetched in the background while the installation starts
+        self.__temp_dir_lock = threading.Lock()
+        self._sources_archive_path = None
         self._sources_dir = None
         self._version = None
         self._package_hash = None
@@ -81,9 +86,15 @@ class ToolInstaller(metaclass=abc.ABCMeta):
         )
 
     def __enter__(self):
-        self._temp_dir = tempfile.TemporaryDirectory()
+        # The sources may have been already fetched into the temporary directory
+        self.__ensure_temp_dir()
         return self
 
+    def __ensure_temp_dir(self):
+        with self.__temp_dir_lock:
+            if not self._temp_dir:
+                self._temp_dir = tempfile.TemporaryDirectory()
+
     def __exit__(self, exception_type, value, traceback):
         self._temp_dir.cleanup()
         if exception_type and self._target_dir and os.path.exists(self._target_dir):
@@ -117,29 +128,59 @@ class ToolInstaller(metaclass=abc.ABCMeta):
             )
         return self._target_dir
 
-    def _acquire_sources(self):
+    def fetch(self, cancel_event: typing.Optional[threading.Event] = None):
+        # Components without remote sources have nothing to fetch
+        pass
+
+    def _download_sources(
+        self, cancel_event: typing.Optional[threading.Event] = None
+    ) -> str:
+        if self._sources_archive_path:
+            return self._sources_archive_path
+
+        self.__ensure_temp_dir()
         parsed_url = urlparse(self._config.url)
         sources_archive_path = os.path.join(
             self._temp_dir.name, os.path.basename(parsed_url.path)
         )
-        self._file_manager.download_file(self._config.url, sources_archive_path)
-
+        # Both hashes are computed while downloading instead of reading it again
+        package_hash = hashlib.sha1()
+        hash_algorithms = [package_hash]
+        expected_hash = None
         if self._config.expected_hash:
-            self._cryptographic_provider.validate_file_hash(
-                sources_archive_path, self._config.expected_hash
+            expected_hash = self._cryptographic_provider.get_expected_hash(
+                self._config.expected_hash
+            )
+            hash_algorithms.append(expected_hash[0])
+
+        self._file_manager.download_file(
+            self._config.url,
+            sources_archive_path,
+            hash_algorithms=hash_algorithms,
+            cancel_event=cancel_event,
+        )
+
+        if expected_hash:
+            self._cryptographic_provider.validate_hash(
+                sources_archive_path, *expected_hash
             )
+        self._package_hash = package_hash.hexdigest()
+        self._sources_archive_path = sources_archive_path
+        return sources_archive_path
 
+    def _acquire_sources(self):
+        sources_archive_path = self._download_sources()
         self._sources_dir = self._file_manager.extract_file(
             sources_archive_path, self._temp_dir.name
         )
-        self._package_hash = self._cryptographic_provider.compute_file_sha1(
-            sources_archive_path
-        )
+
+    def get_required_packages(
+        self,
+    ) -> typing.List[BasePackageInstallationConfiguration]:
+        return self._config.required_packages + self._compute_tool_packages()
 
     def _acquire_packages(self):
-        self._package_manager.install_packages(
-            self._config.required_packages + self._compute_tool_packages()
-        )
+        self._package_manager.install_packages(self.get_required_packages())
 
     def _compute_tool_packages(
         self,
@@ -189,6 +230,9 @@ class ToolSourceInstaller(ToolInstaller):
         self._in_source_build = kwargs.get("in_source_build", False)
         self._timeouts = kwargs.get("timeouts", (300, 900, 300))
 
+    def fetch(self, cancel_event: typing.Optional[threading.Event] = None):
+        self._download_sources(cancel_event=cancel_event)
+
     def _create_config_cmd(self):
         return [
             os.path.join(self._sources_dir, "configure"),
@@ -632,6 +676,9 @@ class DownloadOnlySourcesInstaller(ToolInstaller):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, create_target=False, **kwargs)
 
+    def fetch(self, cancel_event: typing.Optional[threading.Event] = None):
+        self._download_sources(cancel_event=cancel_event)
+
     def run_installation(self) -> ComponentInstallationModel:
         self._acquire_sources()
         self._acquire_packages()
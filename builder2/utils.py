@@ -1,4 +1,5 @@
 import math
+import os
 import re
 
 
@@ -12,3 +13,12 @@ def get_command_timeout(reference_timeout, timeout_multiplier):
         if timeout_multiplier > 1.0
         else reference_timeout
     )
+
+
+def get_available_cpu_count() -> int:
+    # Only the CPUs the process can run on, that in containers can be less
+    # than the ones of the host. Not available in all platforms
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
@@ -0,0 +1,79 @@
+import logging
+import os
+from unittest.mock import MagicMock
+
+from builder2.certificate_manager import CertificateManager
+
+
+class TestSystemCertificates:
+    __DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+    __SYSTEM_CA_LOCATION = "/usr/local/share/ca-certificates"
+    __CERT_FILES = {
+        os.path.join(__DATA_DIR, "test-cert.crt"): "testtestcom.crt",
+        os.path.join(__DATA_DIR, "test-cert-2.crt"): "othertestcom.crt",
+    }
+
+    def test_system_certificates_unchanged(self, caplog):
+        file_manager = self.__build_file_manager_mock(installed=self.__CERT_FILES)
+        command_runner_mock = MagicMock()
+
+        with caplog.at_level(logging.INFO):
+            CertificateManager(
+                file_manager, command_runner_mock
+            ).install_all_certificates(self.__build_summary_mock(), self.__DATA_DIR)
+
+        # Nothing is rewritten and the system truststore is not regenerated
+        file_manager.write_binary_file.assert_not_called()
+        command_runner_mock.run_process.assert_not_called()
+        assert "into system truststore" not in caplog.text
+
+    def test_system_certificates_partially_changed(self, caplog):
+        installed_cert = os.path.join(self.__DATA_DIR, "test-cert.crt")
+        file_manager = self.__build_file_manager_mock(
+            installed={installed_cert: self.__CERT_FILES[installed_cert]}
+        )
+        command_runner_mock = MagicMock()
+
+        with caplog.at_level(logging.INFO):
+            CertificateManager(
+                file_manager, command_runner_mock
+            ).install_all_certificates(self.__build_summary_mock(), self.__DATA_DIR)
+
+        # Only the missing certificate is written and counted
+        file_manager.write_binary_file.assert_called_once()
+        assert file_manager.write_binary_file.call_args[0][0] == os.path.join(
+            self.__SYSTEM_CA_LOCATION, "othertestcom.crt"
+        )
+        command_runner_mock.run_process.assert_called_once_with(
+            ["update-ca-certificates", "--fresh"], stream=False
+        )
+        assert "Installed 1 certificates into system truststore" in caplog.text
+
+    @staticmethod
+    def __build_summary_mock():
+        # No JDKs installed, only the system truststore is updated
+        installation_summary = MagicMock()
+        installation_summary.get_components_by_type.return_value = []
+        return installation_summary
+
+    @classmethod
+    def __build_file_manager_mock(cls, installed):
+        file_manager = MagicMock()
+        file_manager.search_get_files_by_extension.return_value = list(
+            cls.__CERT_FILES.keys()
+        )
+        installed_paths = {
+            os.path.join(cls.__SYSTEM_CA_LOCATION, name): source
+            for source, name in installed.items()
+        }
+
+        def read_file_as_bytes_side_effect(path, **__):
+            # System truststore copies are the same PEM content as the sources
+            source = installed_paths.get(path, path)
+            if not os.path.exists(source):
+                return None
+            with open(source, "rb") as f:
+                return f.read()
+
+        file_manager.read_file_as_bytes.side_effect = read_file_as_bytes_side_effect
+        return file_manager
@@ -0,0 +1,44 @@
+import importlib
+
+import pytest
+
+command_commons = importlib.import_module("builder2.commands.command_commons")
+
+# Module private functions are not reachable through attribute access from a
+# class body, as their names would be mangled
+format_validation_details = getattr(command_commons, "__format_validation_details")
+
+
+class TestValidationDetails:
+    # Marshmallow keys the errors of list items by their index
+    __DETAILS = {
+        "components": {1: {"url": ["Missing data."]}, 0: {"name": ["Invalid."]}},
+        "packages": ["Not a list."],
+    }
+    __EXPECTED = """{
+  "components": {
+    "0": {
+      "name": [
+        "Invalid."
+      ]
+    },
+    "1": {
+      "url": [
+        "Missing data."
+      ]
+    }
+  },
+  "packages": [
+    "Not a list."
+  ]
+}"""
+
+    def test_validation_details_orjson(self):
+        pytest.importorskip("orjson")
+
+        assert format_validation_details(self.__DETAILS) == self.__EXPECTED
+
+    def test_validation_details_json(self, monkeypatch):
+        monkeypatch.setattr(command_commons, "orjson", None)
+
+        assert format_validation_details(self.__DETAILS) == self.__EXPECTED
@@ -0,0 +1,88 @@
+import hashlib
+from unittest.mock import MagicMock
+
+import pytest
+
+from builder2.cryptographic_provider import CryptographicProvider
+from builder2.exceptions import BuilderException
+from builder2.file_manager import FileManager
+
+
+class TestValidateFileHash:
+    __CONTENT = b"test-file-v.0.0 content"
+
+    def test_validate_file_hash_matching(self, tmp_path):
+        file_path = self.__write_file(tmp_path, self.__CONTENT)
+
+        # Checksum files usually have the file name after the hash
+        CryptographicProvider(MagicMock()).validate_file_hash(
+            file_path, f"{hashlib.sha256(self.__CONTENT).hexdigest()}  test.tar.gz"
+        )
+
+    def test_validate_file_hash_mismatching(self, tmp_path):
+        file_path = self.__write_file(tmp_path, self.__CONTENT)
+
+        with pytest.raises(BuilderException):
+            CryptographicProvider(MagicMock()).validate_file_hash(
+                file_path, hashlib.sha256(b"other content").hexdigest()
+            )
+
+    def test_validate_file_hash_uppercase(self, tmp_path):
+        file_path = self.__write_file(tmp_path, self.__CONTENT)
+
+        CryptographicProvider(MagicMock()).validate_file_hash(
+            file_path, hashlib.sha1(self.__CONTENT).hexdigest().upper()
+        )
+
+    def test_validate_file_hash_empty_file(self, tmp_path):
+        file_path = self.__write_file(tmp_path, b"")
+        cryptographic_provider = CryptographicProvider(MagicMock())
+
+        cryptographic_provider.validate_file_hash(file_path, hashlib.md5().hexdigest())
+        with pytest.raises(BuilderException):
+            cryptographic_provider.validate_file_hash(
+                file_path, hashlib.md5(self.__CONTENT).hexdigest()
+            )
+
+    @staticmethod
+    def __write_file(tmp_path, content):
+        file_path = tmp_path.joinpath("test.tar.gz")
+        file_path.write_bytes(content)
+        return file_path
+
+
+class TestFilesHash:
+    def test_files_hash_few_files(self, tmp_path):
+        names = self.__write_files(tmp_path, 3)
+
+        assert CryptographicProvider(MagicMock()).compute_files_hash_sha1(
+            names, names_base=tmp_path
+        ) == self.__build_expected_hash(tmp_path, names)
+
+    def test_files_hash_many_files(self, tmp_path):
+        # Enough files to be read ahead by the shared read threads
+        names = self.__write_files(tmp_path, 100)
+
+        # The second call runs on the read threads the first one started
+        for _ in range(2):
+            assert CryptographicProvider(FileManager()).compute_files_hash_sha1(
+                names, names_base=tmp_path
+            ) == self.__build_expected_hash(tmp_path, names)
+
+    @staticmethod
+    def __write_files(tmp_path, count):
+        names = []
+        for index in range(count):
+            name = f"file-{index:03d}.py"
+            tmp_path.joinpath(name).write_bytes(f"content {index}".encode("utf-8"))
+            names.append(name)
+        # Unsorted on purpose, the digest doesn't depend on the input order
+        return list(reversed(names))
+
+    @staticmethod
+    def __build_expected_hash(tmp_path, names):
+        algorithm = hashlib.sha1()
+        for name in sorted(names):
+            algorithm.update(name.encode("utf-8"))
+            algorithm.update(tmp_path.joinpath(name).read_bytes())
+        return algorithm.hexdigest()
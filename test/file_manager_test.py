@@ -0,0 +1,112 @@
+import dataclasses
+import hashlib
+import json
+import threading
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+import builder2.file_manager
+from builder2.exceptions import BuilderException
+from builder2.file_manager import FileManager
+
+
+class TestDownloadFile:
+    __CHUNKS = [b"first chunk", b"second chunk"]
+
+    @patch("builder2.file_manager.requests.get")
+    def test_download_file_hashed(self, requests_get_mock, tmp_path):
+        requests_get_mock.return_value = self.__build_response_mock()
+        dst_file = tmp_path.joinpath("test.tar.gz")
+        algorithm = hashlib.sha1()
+
+        FileManager().download_file(
+            "https://test.test.com/test.tar.gz", dst_file, hash_algorithms=[algorithm]
+        )
+
+        assert dst_file.read_bytes() == b"".join(self.__CHUNKS)
+        assert algorithm.hexdigest() == hashlib.sha1(dst_file.read_bytes()).hexdigest()
+
+    @patch("builder2.file_manager.requests.get")
+    def test_download_file_cancelled(self, requests_get_mock, tmp_path):
+        response_mock = self.__build_response_mock()
+        requests_get_mock.return_value = response_mock
+        cancel_event = threading.Event()
+        cancel_event.set()
+
+        with pytest.raises(BuilderException):
+            FileManager().download_file(
+                "https://test.test.com/test.tar.gz",
+                tmp_path.joinpath("test.tar.gz"),
+                cancel_event=cancel_event,
+            )
+
+        # Nothing else is read from the connection once cancelled
+        assert tmp_path.joinpath("test.tar.gz").read_bytes() == b""
+        response_mock.close.assert_called_once()
+
+    @classmethod
+    def __build_response_mock(cls):
+        response_mock = MagicMock()
+        response_mock.headers = {
+            "content-length": str(sum(len(chunk) for chunk in cls.__CHUNKS))
+        }
+        response_mock.iter_content.return_value = iter(cls.__CHUNKS)
+        return response_mock
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_backend(request, monkeypatch):
+    # Both the optional orjson path and the stdlib fallback are tested
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(builder2.file_manager, "orjson", None)
+    return request.param
+
+
+class TestReadJsonFile:
+    def test_read_json_file(self, json_backend, tmp_path):
+        path = tmp_path.joinpath("metadata.json")
+        path.write_text('{"components": {"gcc": {"version": "12.3.0"}}, "count": 2}')
+
+        assert FileManager.read_json_file(path) == {
+            "components": {"gcc": {"version": "12.3.0"}},
+            "count": 2,
+        }
+
+    def test_read_json_file_invalid(self, json_backend, tmp_path):
+        path = tmp_path.joinpath("metadata.json")
+        path.write_text('{"components": ')
+
+        # orjson errors subclass the stdlib ones, so callers catch a single type
+        with pytest.raises(json.JSONDecodeError):
+            FileManager.read_json_file(path)
+
+
+@dataclasses.dataclass
+class _TestModel:
+    name: str
+    paths: list
+
+
+class TestWriteAsJson:
+    __CONTENT = {"model": _TestModel("gcc-ñ", ["/tools/gcc/bin"]), "count": 2}
+    __EXPECTED = """{
+  "model": {
+    "name": "gcc-ñ",
+    "paths": [
+      "/tools/gcc/bin"
+    ]
+  },
+  "count": 2
+}
+"""
+
+    def test_write_as_json(self, json_backend, tmp_path):
+        path = tmp_path.joinpath("summary.json")
+
+        FileManager.write_as_json(path, self.__CONTENT)
+
+        # Dataclasses are serialized and the file is the same with both backends
+        assert path.read_text(encoding="utf-8") == self.__EXPECTED
@@ -0,0 +1,166 @@
+import importlib
+from unittest.mock import MagicMock
+
+from builder2.installation_summary import InstallationSummary
+from builder2.models.installation_models import (
+    AptPackageInstallationModel,
+    PipPackageInstallationModel,
+)
+from builder2.models.metadata_models import (
+    AptPackageInstallationConfiguration,
+    CmakeBuildConfiguration,
+    GccBuildConfiguration,
+)
+
+install = importlib.import_module("builder2.commands.install")
+
+# Module private functions are not reachable through attribute access from a
+# class body, as their names would be mangled
+sort_components_by_level = getattr(install, "__sort_components_by_level")
+get_reusable_components = getattr(install, "__get_reusable_components")
+load_previous_summary = getattr(install, "__load_previous_summary")
+get_reused_packages = getattr(install, "__get_reused_packages")
+get_installer_core_count = getattr(install, "__get_installer_core_count")
+
+
+class TestComponentsReuse:
+    def test_unchanged_component_reused(self, tmp_path):
+        component_configs = {"gcc": self.__build_gcc_config()}
+        previous_component = self.__build_previous_component(
+            self.__build_gcc_config(), tmp_path
+        )
+
+        reusable_components = get_reusable_components(
+            sort_components_by_level(component_configs),
+            {"gcc": previous_component},
+        )
+
+        assert reusable_components == {"gcc": previous_component}
+
+    def test_changed_component_not_reused(self, tmp_path):
+        component_configs = {"gcc": self.__build_gcc_config(version="13.2.0")}
+        previous_component = self.__build_previous_component(
+            self.__build_gcc_config(), tmp_path
+        )
+
+        reusable_components = get_reusable_components(
+            sort_components_by_level(component_configs),
+            {"gcc": previous_component},
+        )
+
+        assert not reusable_components
+
+    def test_missing_target_dir_not_reused(self, tmp_path):
+        component_configs = {"gcc": self.__build_gcc_config()}
+        previous_component = self.__build_previous_component(
+            self.__build_gcc_config(), tmp_path.joinpath("deleted")
+        )
+
+        reusable_components = get_reusable_components(
+            sort_components_by_level(component_configs),
+            {"gcc": previous_component},
+        )
+
+        assert not reusable_components
+
+    def test_dependent_of_rebuilt_component_not_reused(self, tmp_path):
+        component_configs = {
+            "gcc": self.__build_gcc_config(version="13.2.0"),
+            "cmake": self.__build_cmake_config(depends_on="gcc"),
+        }
+        previous_components = {
+            "gcc": self.__build_previous_component(self.__build_gcc_config(), tmp_path),
+            "cmake": self.__build_previous_component(
+                self.__build_cmake_config(depends_on="gcc"), tmp_path
+            ),
+        }
+
+        reusable_components = get_reusable_components(
+            sort_components_by_level(component_configs), previous_components
+        )
+
+        # cmake itself didn't change, but gcc is going to be rebuilt
+        assert not reusable_components
+
+    def test_corrupt_previous_summary_ignored(self, tmp_path):
+        file_manager = MagicMock()
+        file_manager.read_json_file.side_effect = ValueError("Unexpected end")
+
+        assert load_previous_summary(str(tmp_path), file_manager) is None
+
+    def test_missing_previous_summary_ignored(self, tmp_path):
+        file_manager = MagicMock()
+        file_manager.read_json_file.side_effect = FileNotFoundError()
+
+        assert load_previous_summary(str(tmp_path), file_manager) is None
+
+    def test_installer_core_count_shared_by_level(self):
+        level = {"gcc": None, "clang": None, "cmake": None}
+
+        # Concurrent builds split the cores, reused components take none
+        assert get_installer_core_count(level, {}, 8) == 2
+        assert get_installer_core_count(level, {"gcc": None, "clang": None}, 8) == 8
+        assert get_installer_core_count(level, {}, 2) == 1
+        assert get_installer_core_count(level, dict.fromkeys(level), 8) == 8
+
+    def test_reused_component_packages_kept(self):
+        reused_installer = MagicMock()
+        reused_installer.get_required_packages.return_value = [
+            AptPackageInstallationConfiguration(name="libgmp-dev"),
+            AptPackageInstallationConfiguration(name="bison", build_transient=True),
+        ]
+        kept_package = self.__build_apt_package("libgmp-dev")
+        previous_packages = [
+            kept_package,
+            self.__build_apt_package("bison"),
+            self.__build_apt_package("libssl-dev"),
+            PipPackageInstallationModel(
+                "conan", "2.0.0", pip_hash="hash", location="/usr/lib"
+            ),
+        ]
+
+        # Only the non transient apt packages of the reused components are kept
+        reused_packages = get_reused_packages(previous_packages, [reused_installer])
+        assert reused_packages == [kept_package]
+
+        # Packages installed again in the re-run are not duplicated
+        installation_summary = InstallationSummary(MagicMock())
+        installation_summary.add_packages(reused_packages)
+        installation_summary.add_packages(
+            [self.__build_apt_package("libgmp-dev"), self.__build_apt_package("make")]
+        )
+        assert [package.name for package in installation_summary.get_packages()] == [
+            "libgmp-dev",
+            "make",
+        ]
+
+    @staticmethod
+    def __build_apt_package(name):
+        return AptPackageInstallationModel(
+            name, None, configuration=AptPackageInstallationConfiguration(name=name)
+        )
+
+    @staticmethod
+    def __build_gcc_config(version="12.3.0"):
+        return GccBuildConfiguration(
+            name="gcc",
+            url=f"https://test.test.com/gcc-{version}.tar.gz",
+            version=version,
+            required_packages=[],
+        )
+
+    @staticmethod
+    def __build_cmake_config(depends_on=None):
+        return CmakeBuildConfiguration(
+            name="cmake",
+            url="https://test.test.com/cmake-3.27.0.tar.gz",
+            required_packages=[],
+            depends_on=depends_on,
+        )
+
+    @staticmethod
+    def __build_previous_component(config, path):
+        previous_component = MagicMock()
+        previous_component.configuration = config
+        previous_component.path = str(path)
+        return previous_component
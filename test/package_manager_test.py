@@ -0,0 +1,37 @@
+from unittest.mock import MagicMock, call
+
+from builder2.models.metadata_models import (
+    AptPackageInstallationConfiguration,
+    PipPackageInstallationConfiguration,
+)
+from builder2.package_manager import PackageManager
+
+
+class TestInstallPackages:
+    def test_install_packages_declared_order(self):
+        calls_mock = MagicMock()
+        package_manager = PackageManager(
+            calls_mock.command_runner, calls_mock.python_manager
+        )
+        pip_package = PipPackageInstallationConfiguration(name="conan")
+
+        package_manager.install_packages(
+            [
+                AptPackageInstallationConfiguration(name="python3-dev"),
+                AptPackageInstallationConfiguration(name="libffi-dev"),
+                pip_package,
+                AptPackageInstallationConfiguration(name="cmake"),
+                AptPackageInstallationConfiguration(name="python3-dev"),
+            ]
+        )
+
+        # Consecutive apt packages share a run, but the pip package is still
+        # installed between the apt packages declared around it
+        assert calls_mock.mock_calls == [
+            call.command_runner.run_process(["apt-get", "update"]),
+            call.command_runner.run_process(
+                ["apt-get", "install", "-y", "python3-dev", "libffi-dev"]
+            ),
+            call.python_manager.install_pip_package(pip_package),
+            call.command_runner.run_process(["apt-get", "install", "-y", "cmake"]),
+        ]
@@ -1,3 +1,4 @@
+import hashlib
 import os
 from unittest.mock import patch, MagicMock
 from urllib.parse import urlparse
@@ -8,6 +9,8 @@ from builder2.tools import JdkInstaller
 
 
 class TestJdk:
+    __DOWNLOADED_CONTENT = b"test-file-v.0.0 content"
+
     @patch("builder2.tools.tool_installers.tempfile.TemporaryDirectory")
     @patch("builder2.tools.tool_installers.pathlib.Path")
     def test_jdk_basic_release_version(self, pathlib_path_mock, tempfile_mock):
@@ -44,9 +47,11 @@ class TestJdk:
             temp_path, os.path.basename(urlparse(config.url).path)
         )
 
-        # Fake package computed hash
-        cryptographic_provider_mock.compute_file_sha1.return_value = (
-            "04582c237a0516d0af6bbec3cace3e40e113e219"
+        # Fake downloaded content, hashed while downloading
+        self.__build_download_file_mock(file_manager)
+        cryptographic_provider_mock.get_expected_hash.return_value = (
+            MagicMock(),
+            config.expected_hash,
         )
 
         # Tar file extract directory
@@ -91,7 +96,7 @@ class TestJdk:
             assert installation.path == target_dir
             assert (
                 installation.package_hash
-                == cryptographic_provider_mock.compute_file_sha1.return_value
+                == hashlib.sha1(self.__DOWNLOADED_CONTENT).hexdigest()
             )
             assert (
                 installation.wellknown_paths
@@ -156,17 +161,19 @@ class TestJdk:
             temp_path, os.path.basename(urlparse(config.url).path)
         )
 
-        # Fake package computed hash
-        cryptographic_provider_mock.compute_file_sha1.return_value = (
-            "04582c237a0516d0af6bbec3cace3e40e113e219"
-        )
-
         # Tar file extract directory
         sources_directory = os.path.join(temp_path, "test-file-v.0.0")
 
         file_manager = MagicMock()
         file_manager.extract_file.return_value = sources_directory
 
+        # Fake downloaded content, hashed while downloading
+        self.__build_download_file_mock(file_manager)
+        cryptographic_provider_mock.get_expected_hash.return_value = (
+            MagicMock(),
+            config.expected_hash,
+        )
+
         # Mock read version file
         def read_file_and_search_group_side_effect(*args, **__):
             if args[0] == os.path.join(target_dir, "version.txt"):
@@ -203,7 +210,7 @@ class TestJdk:
             assert installation.path == target_dir
             assert (
                 installation.package_hash
-                == cryptographic_provider_mock.compute_file_sha1.return_value
+                == hashlib.sha1(self.__DOWNLOADED_CONTENT).hexdigest()
             )
             assert (
                 installation.wellknown_paths
@@ -233,6 +240,14 @@ class TestJdk:
             temp_path,
         )
 
+    @classmethod
+    def __build_download_file_mock(cls, file_manager):
+        def download_file_side_effect(_, __, hash_algorithms=None, cancel_event=None):
+            for algorithm in hash_algorithms or []:
+                algorithm.update(cls.__DOWNLOADED_CONTENT)
+
+        file_manager.download_file.side_effect = download_file_side_effect
+
     @staticmethod
     def __build_pathlib_bin_mock(pathlib_path_mock, target_dir):
         target_dir_base_path_mock = MagicMock()
@@ -269,13 +284,16 @@ class TestJdk:
         )
         # Ensure tar file is extracted from sources dir to the temp dir
         file_manager.extract_file.assert_called_once_with(tar_file_path, temp_path)
-        # Ensure hash is computed for the tarfile
-        cryptographic_provider_mock.compute_file_sha1.assert_called_once_with(
-            tar_file_path
-        )
+        # Ensure the tarfile is downloaded once and not hashed again
+        file_manager.download_file.assert_called_once()
+        cryptographic_provider_mock.compute_file_sha1.assert_not_called()
         # Ensure hash is validated
-        cryptographic_provider_mock.validate_file_hash.assert_called_once_with(
-            tar_file_path, config.expected_hash
+        cryptographic_provider_mock.get_expected_hash.assert_called_once_with(
+            config.expected_hash
+        )
+        cryptographic_provider_mock.validate_hash.assert_called_once_with(
+            tar_file_path,
+            *cryptographic_provider_mock.get_expected_hash.return_value,
         )
         # Ensure required packages are installed
         package_manager_mock.install_packages.assert_called_once_with(